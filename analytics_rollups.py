@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Analytics Rollups
+Keeps materialized daily, weekly and monthly sales and stock-movement aggregates per SKU.
+Appending a day only touches the buckets that day falls into, so refreshes stay cheap as history grows.
+"""
+
+import hashlib
+import numpy as np
+import os
+import pickle
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from import_workbook import import_csv_directory
+from inventory_model import Product, Transaction
+from shard_sheets import table_records
+
+# Rollup store file kept inside each sheets directory, so every catalog has a sales history of its own
+STORE_FILENAME = "analytics_rollups.pkl"
+# Store for workbooks not built from a sheets directory, such as one edited by hand
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), STORE_FILENAME)
+
+# Analytics sections generated from the rollups, found by their title rows
+PERFORMANCE_TITLE = "📊 PERFORMANCE DASHBOARD"
+CATEGORY_TITLE = "🎯 CATEGORY PERFORMANCE"
+CATEGORY_HEADERS = ["Category", "Revenue", "Profit", "Margin %", "Units Sold", "Avg Price", "Growth vs Last Month"]
+
+GRAINS = ("daily", "weekly", "monthly")
+METRICS = ("units", "revenue", "cost", "received")
+
+def period_keys(day):
+    """Bucket keys for a day at every grain"""
+    iso_year, iso_week, _ = day.isocalendar()
+    return {
+        "daily": day.isoformat(),
+        "weekly": f"{iso_year}-W{iso_week:02d}",
+        "monthly": day.strftime("%Y-%m"),
+    }
+
+def reduce_by_code(codes, values):
+    """Sum metric rows that share a code, returning sorted unique codes and their totals"""
+    unique, inverse = np.unique(codes, return_inverse=True)
+    totals = np.empty((len(unique), values.shape[1]))
+    for col in range(values.shape[1]):
+        totals[:, col] = np.bincount(inverse, weights=values[:, col], minlength=len(unique))
+    return unique, totals
+
+class RollupStore:
+    """Materialized aggregates over the sales and stock-movement history"""
+
+    def __init__(self):
+        self.skus = []
+        self.sku_index = {}
+        self.categories = []
+        self.category_index = {}
+        # Category code for each SKU code
+        self.sku_category = np.zeros(0, dtype=np.int32)
+        # grain -> period -> (sorted SKU codes, metrics matrix)
+        self.buckets = {grain: {} for grain in GRAINS}
+        # ISO day -> digest of the QuickAdd rows folded in for it, to spot days not yet folded in
+        self.day_digests = {}
+
+    def encode(self, skus, categories):
+        """Map SKU strings to integer codes, registering new SKUs as they appear"""
+        codes = np.empty(len(skus), dtype=np.int32)
+        new_categories = []
+        for pos, (sku, category) in enumerate(zip(skus, categories)):
+            code = self.sku_index.get(sku)
+            if code is None:
+                code = len(self.skus)
+                self.sku_index[sku] = code
+                self.skus.append(sku)
+                if category not in self.category_index:
+                    self.category_index[category] = len(self.categories)
+                    self.categories.append(category)
+                new_categories.append(self.category_index[category])
+            codes[pos] = code
+        if new_categories:
+            self.sku_category = np.concatenate([self.sku_category, np.array(new_categories, dtype=np.int32)])
+        return codes
+
+    def merge(self, grain, period, codes, values):
+        """Add per-SKU metric rows into one bucket"""
+        existing = self.buckets[grain].get(period)
+        if existing is not None:
+            codes = np.concatenate([existing[0], codes])
+            values = np.vstack([existing[1], values])
+            codes, values = reduce_by_code(codes, values)
+        self.buckets[grain][period] = (codes, values)
+
+    def append_day(self, day, skus, categories, units, revenue, cost, received):
+        """Fold one day of per-SKU movements into the daily, weekly and monthly buckets"""
+        codes = self.encode(skus, categories)
+        values = np.column_stack([units, revenue, cost, received]).astype(float)
+        codes, values = reduce_by_code(codes, values)
+
+        keys = period_keys(day)
+        previous = self.buckets["daily"].get(keys["daily"])
+        if previous is not None:
+            # Replacing a day already loaded: back its totals out of the wider buckets first
+            for grain in ("weekly", "monthly"):
+                self.merge(grain, keys[grain], previous[0], -previous[1])
+            del self.buckets["daily"][keys["daily"]]
+
+        for grain in GRAINS:
+            self.merge(grain, keys[grain], codes, values)
+
+    def periods(self, grain):
+        """Period keys present at a grain, oldest first"""
+        return sorted(self.buckets[grain])
+
+    def totals(self, grain, period):
+        """Metric totals across all SKUs for one period as a dict"""
+        bucket = self.buckets[grain].get(period)
+        if bucket is None:
+            return dict.fromkeys(METRICS, 0.0)
+        return dict(zip(METRICS, bucket[1].sum(axis=0)))
+
+    def by_sku(self, grain, period):
+        """SKU names and their metrics matrix for one period"""
+        codes, values = self.buckets[grain].get(period, (np.zeros(0, dtype=np.int32), np.zeros((0, len(METRICS)))))
+        return [self.skus[code] for code in codes], values
+
+    def by_category(self, grain, period):
+        """Category names and their metrics matrix for one period"""
+        codes, values = self.buckets[grain].get(period, (np.zeros(0, dtype=np.int32), np.zeros((0, len(METRICS)))))
+        if not len(codes):
+            return [], np.zeros((0, len(METRICS)))
+        category_codes, totals = reduce_by_code(self.sku_category[codes], values)
+        return [self.categories[code] for code in category_codes], totals
+
+    def positions(self, skus):
+        """Position of each stored SKU code in the requested list (-1 when not requested)"""
+        positions = np.full(len(self.skus), -1, dtype=np.int64)
+        for pos, sku in enumerate(skus):
+            code = self.sku_index.get(sku)
+            if code is not None:
+                positions[code] = pos
+        return positions
+
+    def window_totals(self, skus, months=12):
+        """Metric totals per SKU over the latest months, aligned to skus, plus the number of days covered"""
+        totals = np.zeros((len(skus), len(METRICS)))
+        periods = self.periods("monthly")[-months:]
+        if not periods:
+            return totals, 0
+        positions = self.positions(skus)
+        for period in periods:
+            codes, values = self.buckets["monthly"][period]
+            target = positions[codes]
+            keep = target >= 0
+            totals[target[keep]] += values[keep]
+
+        days = [period for period in self.periods("daily") if period[:7] >= periods[0]]
+        first = datetime.strptime(days[0], "%Y-%m-%d")
+        last = datetime.strptime(days[-1], "%Y-%m-%d")
+        return totals, (last - first).days + 1
+
+    def series(self, skus, grain="weekly", count=104, metric="units"):
+        """Dense (SKU x period) matrix of one metric over the latest periods, including empty ones"""
+        days = self.periods("daily")
+        if not days:
+            return np.zeros((len(skus), 0)), []
+        step = 7 if grain == "weekly" else 1
+        last = datetime.strptime(days[-1], "%Y-%m-%d").date()
+        first = datetime.strptime(days[0], "%Y-%m-%d").date()
+        periods = []
+        day = last
+        while day >= first - timedelta(days=step - 1) and len(periods) < count:
+            periods.append(period_keys(day)[grain])
+            day -= timedelta(days=step)
+        periods.reverse()
+
+        positions = self.positions(skus)
+        column = METRICS.index(metric)
+        matrix = np.zeros((len(skus), len(periods)))
+        for col, period in enumerate(periods):
+            bucket = self.buckets[grain].get(period)
+            if bucket is None:
+                continue
+            target = positions[bucket[0]]
+            keep = target >= 0
+            matrix[target[keep], col] = bucket[1][keep, column]
+        return matrix, periods
+
+    def save(self, path=DEFAULT_STORE_PATH):
+        """Persist the store, replacing the previous file in one step"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(self.__dict__, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_STORE_PATH):
+        """Load a persisted store, or return an empty one if none exists yet"""
+        store = cls()
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                store.__dict__.update(pickle.load(file))
+        return store
+
+def append_transactions(store, transactions, products):
+    """Fold QuickAdd transactions into the store, one call per day"""
+    by_name = {product.name: product for product in products}
+    days = defaultdict(list)
+    for transaction in transactions:
+        product = by_name.get(transaction.product)
+        if transaction.date is None or transaction.change is None or product is None:
+            continue
+        days[transaction.date].append((transaction, product))
+
+    for day in sorted(days):
+        skus, categories, units, revenue, cost, received = [], [], [], [], [], []
+        for transaction, product in days[day]:
+            sold = -transaction.change if transaction.change < 0 and transaction.type == "Sale" else 0
+            skus.append(product.sku)
+            categories.append(product.category)
+            units.append(sold)
+            revenue.append(sold * (product.retail_price or 0))
+            cost.append(sold * (product.cost or 0))
+            received.append(transaction.change if transaction.change > 0 else 0)
+        store.append_day(day, skus, categories, units, revenue, cost, received)
+    return store
+
+def day_digest(transactions):
+    """Order-independent digest of one day's QuickAdd rows"""
+    digest = hashlib.blake2b(digest_size=8)
+    for row in sorted(repr(transaction.to_row()) for transaction in transactions):
+        digest.update(row.encode('utf-8'))
+    return digest.digest()
+
+def sync_transactions(store, transactions, products):
+    """Fold in only the days whose QuickAdd rows differ from those last folded in, returning those days"""
+    days = defaultdict(list)
+    for transaction in transactions:
+        if transaction.date is not None:
+            days[transaction.date].append(transaction)
+    changed = sorted(day for day, rows in days.items() if store.day_digests.get(day.isoformat()) != day_digest(rows))
+    if not changed:
+        return []
+
+    append_transactions(store, [transaction for day in changed for transaction in days[day]], products)
+    # A day whose rows all name unknown products still replaces what was folded in before
+    folded = set(store.buckets["daily"])
+    names = {product.name for product in products}
+    for day in changed:
+        if day.isoformat() in folded and not any(transaction.product in names for transaction in days[day]):
+            store.append_day(day, [], [], [], [], [], [])
+        store.day_digests[day.isoformat()] = day_digest(days[day])
+    return changed
+
+def format_change(difference, prefix="", suffix="", decimals=0):
+    """Signed difference such as "+$2,050" or "-0.8%" """
+    sign = "+" if difference >= 0 else "-"
+    return f"{sign}{prefix}{abs(difference):,.{decimals}f}{suffix}"
+
+def performance_rows(store, month=None):
+    """Month-over-month rows for the Analytics performance dashboard, or None without history"""
+    months = store.periods("monthly")
+    if month is None:
+        if not months:
+            return None
+        month = months[-1]
+    earlier = [period for period in months if period < month]
+    previous_month = earlier[-1] if earlier else None
+
+    current = store.totals("monthly", month)
+    previous = store.totals("monthly", previous_month) if previous_month else dict.fromkeys(METRICS, 0.0)
+
+    def margin(totals):
+        return (totals["revenue"] - totals["cost"]) / totals["revenue"] * 100 if totals["revenue"] else 0.0
+
+    def label(period):
+        return datetime.strptime(period, "%Y-%m").strftime("%B %Y") if period else "--"
+
+    current_profit = current["revenue"] - current["cost"]
+    previous_profit = previous["revenue"] - previous["cost"]
+    growth = (current["revenue"] - previous["revenue"]) / previous["revenue"] * 100 if previous["revenue"] else 0.0
+
+    return [
+        ["Current Month", label(month), "", "Previous Month", label(previous_month), "", "Growth", f"{growth:+.1f}%"],
+        ["Total Revenue", f"${current['revenue']:,.0f}", "", "Total Revenue", f"${previous['revenue']:,.0f}", "", "Revenue Growth", format_change(current["revenue"] - previous["revenue"], "$")],
+        ["Total Profit", f"${current_profit:,.0f}", "", "Total Profit", f"${previous_profit:,.0f}", "", "Profit Growth", format_change(current_profit - previous_profit, "$")],
+        ["Profit Margin", f"{margin(current):.1f}%", "", "Profit Margin", f"{margin(previous):.1f}%", "", "Margin Change", format_change(margin(current) - margin(previous), suffix="%", decimals=1)],
+        ["Units Sold", int(current["units"]), "", "Units Sold", int(previous["units"]), "", "Volume Growth", format_change(current["units"] - previous["units"], suffix=" units")],
+    ]
+
+def category_rows(store, month=None):
+    """Per-category revenue, profit, margin, units, average price and revenue growth for one month, highest revenue first"""
+    months = store.periods("monthly")
+    if month is None:
+        if not months:
+            return []
+        month = months[-1]
+    earlier = [period for period in months if period < month]
+    previous = {}
+    if earlier:
+        previous_names, previous_values = store.by_category("monthly", earlier[-1])
+        previous = dict(zip(previous_names, previous_values[:, METRICS.index("revenue")]))
+    names, values = store.by_category("monthly", month)
+    rows = []
+    for pos in np.argsort(-values[:, METRICS.index("revenue")]):
+        units, revenue, cost, _ = values[pos]
+        margin = (revenue - cost) / revenue * 100 if revenue else 0.0
+        average_price = f"${revenue / units:,.2f}" if units else "--"
+        previous_revenue = previous.get(names[pos], 0.0)
+        growth = format_change((revenue - previous_revenue) / previous_revenue * 100, suffix="%", decimals=1) if previous_revenue else "--"
+        rows.append([names[pos], f"${revenue:,.0f}", f"${revenue - cost:,.0f}", f"{margin:.1f}%", int(units), average_price, growth])
+    return rows
+
+def section_block(rows, title):
+    """(start, stop) positions of the rows under a section title, up to the next blank row, or None"""
+    for index, row in enumerate(rows):
+        if row and row[0] == title:
+            start = index + 1
+            while start < len(rows) and not any(rows[start]):
+                start += 1
+            stop = start
+            while stop < len(rows) and any(rows[stop]):
+                stop += 1
+            return start, stop
+    return None
+
+def analytics_edits(rows, store):
+    """(start, stop, new rows) replacing the Analytics performance and category sections, last first
+
+    rows are the sheet's rows as lists of values; without sales history there is nothing to replace.
+    """
+    performance = performance_rows(store)
+    if performance is None:
+        return []
+    edits = []
+    for title, new_rows in ((PERFORMANCE_TITLE, performance), (CATEGORY_TITLE, [CATEGORY_HEADERS] + category_rows(store))):
+        block = section_block(rows, title)
+        if block is not None:
+            edits.append(block + (new_rows,))
+    return sorted(edits, key=lambda edit: edit[0], reverse=True)
+
+def analytics_sheet_rows(rows, store):
+    """Analytics CSV rows with the performance dashboard and category performance generated from the store"""
+    rows = list(rows)
+    for start, stop, new_rows in analytics_edits(rows, store):
+        rows[start:stop] = [[str(value) for value in row] for row in new_rows]
+    return rows
+
+def store_path_for(sheets_dir):
+    """Rollup store of a sheets directory, or the default store without one"""
+    return os.path.join(sheets_dir, STORE_FILENAME) if sheets_dir else DEFAULT_STORE_PATH
+
+def load_default_rollups(sheets_dir=None, store_path=None):
+    """Load the rollups of a sheets directory and fold in the QuickAdd days of its CSVs not yet in them"""
+    if store_path is None:
+        store_path = store_path_for(sheets_dir)
+    store = RollupStore.load(store_path)
+    if sheets_dir is None:
+        return store
+    tables = {sheet_name: list(records)
+              for sheet_name, records in import_csv_directory(sheets_dir, ["Products", "QuickAdd"])}
+    if sync_transactions(store, tables.get("QuickAdd", []), tables.get("Products", [])):
+        store.save(store_path)
+    return store
+
+def load_workbook_rollups(wb, store_path=DEFAULT_STORE_PATH):
+    """Load the persisted rollups and fold in the QuickAdd days of an in-memory workbook not yet in them"""
+    store = RollupStore.load(store_path)
+    if sync_transactions(store, table_records(wb, Transaction), table_records(wb, Product)):
+        store.save(store_path)
+    return store
+
+if __name__ == "__main__":
+    sheets_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets")
+    store = load_default_rollups(sheets_dir)
+    print(f"Rollups updated: {len(store.periods('daily'))} days, {len(store.skus)} SKUs")
+    for row in performance_rows(store) or []:
+        print(row)
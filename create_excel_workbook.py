@@ -10,8 +10,22 @@ from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 import os
 import csv
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
 from datetime import datetime, timedelta
 
+from analytics_rollups import load_default_rollups, analytics_sheet_rows
+from inventory_metrics import (compute_metrics, write_metric_columns, write_analytics_summary, update_efficiency_turnover,
+                               update_dashboard_turnover)
+from import_workbook import iter_table_values
+from inventory_model import RECORD_TYPES, Product, InventoryItem
+from demand_forecast import plan_reorders, order_cost, reorder_costs, write_inventory_plan, write_reorder_plan
+from parallel_csv import parse_csv_table
+from shard_sheets import (SHARD_ROWS, ShardedTable, shard_table, read_sheet, shard_title, shard_filename,
+                          sheet_link, add_index_sheet)
+from sheet_layouts import LAYOUTS, compile_layout, format_with_layout, status_styles
+from workbook_io import save_workbook
+
 # Define color scheme based on the Beauty Pro brand
 class BeautyProColors:
     DEEP_CHARCOAL = "2C3E50"
@@ -26,55 +40,196 @@ class BeautyProColors:
     LIGHT_BORDER = "DEE2E6"
     DARK_TEXT = "566573"
 
+# Sheet order and source CSVs
+SHEETS_DATA = [
+    ("Dashboard", "Dashboard.csv"),
+    ("Categories", "Categories.csv"),
+    ("Suppliers", "Suppliers.csv"),
+    ("Products", "Products.csv"),
+    ("Inventory", "Inventory.csv"),
+    ("QuickAdd", "QuickAdd.csv"),
+    ("Reorder", "Reorder.csv"),
+    ("Analytics", "Analytics.csv"),
+    ("Instructions", "Instructions.csv")
+]
+
+# Tables the margins, metrics and reorder plan are computed from
+DERIVED_INPUT_SHEETS = ("Products", "Inventory", "Suppliers", "Reorder")
+# Sheets DerivedColumns.write adds columns to
+DERIVED_COLUMN_SHEETS = ("Products", "Inventory", "Reorder")
+# Companion shard workbooks queued on the pool at once, bounding the shard rows held in memory
+MAX_PENDING_SHARDS = os.cpu_count() or 1
+
 def create_excel_workbook():
     """Create the complete Beauty Pro Inventory System Excel workbook"""
     
+    # Tables too large for one sheet are written as companion workbooks next to this one
+    wb = build_workbook("/home/grig/Projects/inventory_template/sheets/",
+                        shard_dir="/home/grig/Projects/inventory_template/shards")
+    
+    # Save workbook
+    output_path = "/home/grig/Projects/inventory_template/Beauty_Pro_Inventory_System.xlsx"
+    save_workbook(wb, output_path)
+    print(f"Excel workbook saved to: {output_path}")
+    
+    return output_path
+
+def build_workbook(base_path, shard_dir=None, shard_by="rows", shard_rows=SHARD_ROWS, rollups=None):
+    """Build the formatted workbook in memory from the sheet CSVs in base_path
+    
+    Tables longer than shard_rows are split by row range or by a column such as category or supplier
+    (shard_by) and replaced with an index sheet: the shards become sheets of this workbook, or, with a
+    shard_dir next to the saved workbook, companion workbooks written in parallel. A sharded table is
+    streamed from its CSV and never held in memory whole. rollups defaults to base_path's own store.
+    """
+    
     # Create workbook
     wb = Workbook()
     
     # Remove default sheet
     wb.remove(wb.active)
     
-    # Define sheet order and data
-    sheets_data = [
-        ("Dashboard", "Dashboard.csv"),
-        ("Categories", "Categories.csv"),
-        ("Suppliers", "Suppliers.csv"),
-        ("Products", "Products.csv"),
-        ("Inventory", "Inventory.csv"),
-        ("QuickAdd", "QuickAdd.csv"),
-        ("Reorder", "Reorder.csv"),
-        ("Analytics", "Analytics.csv"),
-        ("Instructions", "Instructions.csv")
-    ]
+    # Sales rollups, with the QuickAdd days of these sheets not yet in them folded in
+    if rollups is None:
+        rollups = load_default_rollups(base_path)
     
-    base_path = "/home/grig/Projects/inventory_template/sheets/"
+    # Margins, turnover, days of supply, ABC classes and the demand forecast, written into each
+    # table worksheet or shard as it is built
+    derived = DerivedColumns(read_derived_inputs(base_path), rollups)
     
-    for sheet_name, csv_file in sheets_data:
-        print(f"Creating {sheet_name} worksheet...")
-        
-        # Create worksheet
-        ws = wb.create_sheet(title=sheet_name)
-        
-        # Read CSV data
-        csv_path = os.path.join(base_path, csv_file)
-        data = read_csv_data(csv_path)
-        
-        # Add data to worksheet
-        populate_worksheet(ws, data, sheet_name)
+    builder = SheetBuilder(wb, derived, shard_dir, shard_by, shard_rows)
+    try:
+        for sheet_name, csv_file in SHEETS_DATA:
+            print(f"Creating {sheet_name} worksheet...")
+            
+            # Read CSV data, planning shards while streaming a table too long for one sheet
+            csv_path = os.path.join(base_path, csv_file)
+            builder.add(sheet_name, read_sheet(csv_path, RECORD_TYPES.get(sheet_name), shard_by, shard_rows,
+                                               derived.row_totals(sheet_name)))
+    finally:
+        # Companion workbooks must be complete before the index pointing at them is saved
+        builder.close()
+    
+    # Turnover summary on Analytics and the Dashboard figure
+    derived.write_summaries(wb)
+    
+    return wb
+
+def read_derived_inputs(base_path):
+    """Records of the tables the derived columns are computed from, keyed by sheet name"""
+    tables = {}
+    for sheet_name in DERIVED_INPUT_SHEETS:
+        csv_path = os.path.join(base_path, f"{sheet_name}.csv")
+        record_cls = RECORD_TYPES[sheet_name]
+        tables[sheet_name] = parse_csv_table(csv_path, record_cls) if os.path.exists(csv_path) else []
+    return tables
+
+class DerivedColumns:
+    """Margins, catalog metrics and the reorder plan, computed once from the table records
+
+    Each Products, Inventory and Reorder worksheet or shard gets its columns as it is built, so the
+    derived values do not depend on the table being in one sheet of the workbook. The Analytics
+    sections kept in the rollups are generated into its rows before it is built.
+    """
+
+    def __init__(self, tables, rollups):
+        self.rollups = rollups
+        products, inventory = tables["Products"], tables["Inventory"]
+        self.metrics = compute_metrics(products, inventory, rollups)
+        self.plan = None
+        self.costs = None
+        if rollups.periods("daily"):
+            self.plan = plan_reorders(products, inventory, tables["Suppliers"], rollups)
+            self.costs = reorder_costs(tables["Reorder"], self.plan)
+
+    def write(self, ws, sheet_name):
+        """Write the derived columns of sheet_name's table into one worksheet or shard"""
+        if sheet_name == "Products":
+            write_margins(ws)
+            write_metric_columns(ws, Product, self.metrics)
+        elif sheet_name == "Inventory":
+            write_metric_columns(ws, InventoryItem, self.metrics)
+            if self.plan is not None:
+                write_inventory_plan(ws, self.plan)
+        elif sheet_name == "Reorder" and self.plan is not None:
+            write_reorder_plan(ws, self.plan, self.costs)
+
+    def shard(self, sheet_name, data):
+        """Copy holding only the derived values of one shard's rows, to send to the process writing it
+
+        None for sheets without derived columns.
+        """
+        if sheet_name not in DERIVED_COLUMN_SHEETS:
+            return None
+        names = set(iter_table_values(data, RECORD_TYPES[sheet_name], "name"))
+        shard = copy(self)
+        shard.rollups = None
+        shard.metrics = self.metrics.subset(names)
+        if self.plan is not None:
+            shard.plan = self.plan.subset(names)
+        return shard
+
+    def sheet_rows(self, sheet_name, data):
+        """Rows of sheet_name with the sections generated from the rollups filled in"""
+        if sheet_name == "Analytics":
+            return analytics_sheet_rows(data, self.rollups)
+        return data
+
+    def row_totals(self, sheet_name):
+        """Index totals of one row for the columns write() rewrites, so the index matches the shards"""
+        if sheet_name != "Reorder" or self.plan is None:
+            return None
         
-        # Apply formatting
-        format_worksheet(ws, sheet_name)
-    
-    # Add formulas and validation after all sheets are created
-    add_formulas_and_validation(wb)
-    
-    # Save workbook
-    output_path = "/home/grig/Projects/inventory_template/Beauty_Pro_Inventory_System.xlsx"
-    wb.save(output_path)
-    print(f"Excel workbook saved to: {output_path}")
-    
-    return output_path
+        def totals(record):
+            _, order_qty, cost = order_cost(record, self.plan)
+            return {"Order Qty": order_qty, "Total Cost": cost}
+        return totals
+
+    def write_summaries(self, wb):
+        write_analytics_summary(wb["Analytics"], self.metrics)
+        update_efficiency_turnover(wb["Analytics"], self.metrics)
+        update_dashboard_turnover(wb["Dashboard"], self.metrics)
+
+class SheetBuilder:
+    """Builds worksheets into a workbook, sharding long tables and writing companion shards on one pool"""
+
+    def __init__(self, wb, derived=None, shard_dir=None, shard_by="rows", shard_rows=SHARD_ROWS):
+        self.wb = wb
+        self.derived = derived
+        self.shard_dir = shard_dir
+        self.shard_by = shard_by
+        self.shard_rows = shard_rows
+        self.pool = None
+        self.pending = []
+
+    def add(self, sheet_name, data, index=None):
+        """Build one sheet from its rows or a ShardedTable, at position index if given"""
+        record_cls = RECORD_TYPES.get(sheet_name)
+        table = data
+        if not isinstance(data, ShardedTable):
+            if self.derived is not None:
+                data = self.derived.sheet_rows(sheet_name, data)
+            row_totals = self.derived.row_totals(sheet_name) if self.derived is not None else None
+            table = shard_table(data, record_cls, self.shard_by, self.shard_rows, row_totals) if record_cls else None
+        if table is None:
+            # Create, populate and format the worksheet
+            return build_worksheet(self.wb, sheet_name, data, index, derived=self.derived)
+        print(f"Sharding {sheet_name} into {len(table.shards)} parts...")
+        if self.shard_dir is not None and self.pool is None:
+            self.pool = ProcessPoolExecutor()
+        return build_shards(self.wb, sheet_name, table, self.shard_dir, self.pool, index, self.derived, self.pending)
+
+    def close(self):
+        """Wait for the companion shards still being written"""
+        if self.pool is None:
+            return
+        try:
+            for future in self.pending:
+                future.result()
+        finally:
+            self.pool.shutdown()
+            self.pool = None
+            self.pending = []
 
 def read_csv_data(csv_path):
     """Read CSV data and return as list of lists"""
@@ -91,6 +246,57 @@ def read_csv_data(csv_path):
     
     return data
 
+def build_worksheet(wb, sheet_name, data, index=None, title=None, derived=None):
+    """Create one worksheet from its CSV rows, at position index if given, formatted by sheet_name's layout"""
+    ws = wb.create_sheet(title=title or sheet_name, index=index)
+    populate_worksheet(ws, data, sheet_name)
+    format_worksheet(ws, sheet_name)
+    if derived is not None:
+        derived.write(ws, sheet_name)
+    return ws
+
+def build_shards(wb, sheet_name, table, shard_dir=None, pool=None, index=None, derived=None, pending=None):
+    """Write the index sheet, at position index if given, and each shard after it
+
+    Shards written on the pool are added to pending; at most MAX_PENDING_SHARDS are in flight, so only
+    a few shards' rows are held in memory at once.
+    """
+    taken = set(wb.sheetnames) | {sheet_name}
+    for number, shard in enumerate(table.shards, 1):
+        if shard_dir is None:
+            shard.title = shard_title(taken, sheet_name, shard.label)
+            taken.add(shard.title)
+            shard.link = sheet_link(shard.title)
+        else:
+            filename = shard_filename(sheet_name, number, shard.label)
+            shard.path = os.path.join(shard_dir, filename)
+            # Relative link, so the workbook and its shards folder can be moved together
+            shard.link = f"{os.path.basename(os.path.normpath(shard_dir))}/{filename}"
+    ws = add_index_sheet(wb, sheet_name, table, worksheet_styles(), index)
+    
+    if pending is None:
+        pending = []
+    if shard_dir is not None:
+        os.makedirs(shard_dir, exist_ok=True)
+    for number, (shard, rows) in enumerate(table.iter_shards(), 1):
+        if shard_dir is None:
+            build_worksheet(wb, sheet_name, rows, None if index is None else index + number, shard.title, derived)
+            continue
+        in_flight = [future for future in pending if not future.done()]
+        if len(in_flight) >= MAX_PENDING_SHARDS:
+            in_flight[0].result()
+        pending.append(pool.submit(write_shard_workbook, shard.path, sheet_name, rows,
+                                   None if derived is None else derived.shard(sheet_name, rows)))
+    return ws
+
+def write_shard_workbook(path, sheet_name, data, derived=None):
+    """Save one shard as a workbook of its own"""
+    wb = Workbook()
+    wb.remove(wb.active)
+    build_worksheet(wb, sheet_name, data, derived=derived)
+    save_workbook(wb, path)
+    return path
+
 def populate_worksheet(ws, data, sheet_name):
     """Populate worksheet with data"""
     if not data:
@@ -102,20 +308,17 @@ def populate_worksheet(ws, data, sheet_name):
             if cell_value:  # Only add non-empty values
                 ws.cell(row=row_idx, column=col_idx, value=cell_value)
 
-def format_worksheet(ws, sheet_name):
-    """Apply professional formatting to worksheet"""
+def worksheet_styles():
+    """Style attributes for each layout role"""
     
     # Define fonts
-    header_font = Font(name='Arial', size=14, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
+    title_font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
     subheader_font = Font(name='Arial', size=12, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
     body_font = Font(name='Arial', size=10, color=BeautyProColors.DARK_TEXT)
     
     # Define fills
     header_fill = PatternFill(start_color=BeautyProColors.ROSE_GOLD, end_color=BeautyProColors.ROSE_GOLD, fill_type="solid")
     subheader_fill = PatternFill(start_color=BeautyProColors.CREAM_WHITE, end_color=BeautyProColors.CREAM_WHITE, fill_type="solid")
-    success_fill = PatternFill(start_color=BeautyProColors.SUCCESS, end_color=BeautyProColors.SUCCESS, fill_type="solid")
-    warning_fill = PatternFill(start_color=BeautyProColors.WARNING, end_color=BeautyProColors.WARNING, fill_type="solid")
-    critical_fill = PatternFill(start_color=BeautyProColors.CRITICAL, end_color=BeautyProColors.CRITICAL, fill_type="solid")
     
     # Define borders
     thin_border = Border(
@@ -125,268 +328,25 @@ def format_worksheet(ws, sheet_name):
         bottom=Side(style='thin', color=BeautyProColors.LIGHT_BORDER)
     )
     
-    # Apply sheet-specific formatting
-    if sheet_name == "Dashboard":
-        format_dashboard(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border)
-    elif sheet_name == "Categories":
-        format_categories(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border)
-    elif sheet_name == "Suppliers":
-        format_suppliers(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border)
-    elif sheet_name == "Products":
-        format_products(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border)
-    elif sheet_name == "Inventory":
-        format_inventory(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border)
-    elif sheet_name == "QuickAdd":
-        format_quickadd(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border)
-    elif sheet_name == "Reorder":
-        format_reorder(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border)
-    elif sheet_name == "Analytics":
-        format_analytics(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border)
-    elif sheet_name == "Instructions":
-        format_instructions(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border)
-    
-    # Auto-adjust column widths
-    adjust_column_widths(ws)
-
-def format_dashboard(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border):
-    """Format Dashboard worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:J2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Section headers
-    section_headers = ['A4', 'F4', 'I4', 'A11', 'D11', 'G11', 'A20', 'D20', 'G20', 'A27', 'D27', 'G27']
-    for cell in section_headers:
-        if ws[cell].value:
-            ws[cell].font = subheader_font
-            ws[cell].fill = subheader_fill
-    
-    # Status indicators - color code based on content
-    for row in ws.iter_rows(min_row=6, max_row=32):
-        for cell in row:
-            if cell.value:
-                if '🟢' in str(cell.value) or 'Healthy' in str(cell.value):
-                    cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-                elif '🟡' in str(cell.value) or 'Low Stock' in str(cell.value):
-                    cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                elif '🔴' in str(cell.value) or 'Out of Stock' in str(cell.value):
-                    cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-
-def format_categories(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border):
-    """Format Categories worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:H2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Data table header
-    for col in range(1, 9):  # A to H
-        cell = ws.cell(row=4, column=col)
-        if cell.value:
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.border = thin_border
-    
-    # Data rows
-    for row in range(6, 12):  # Data rows
-        for col in range(1, 9):
-            cell = ws.cell(row=row, column=col)
-            if cell.value:
-                cell.font = body_font
-                cell.border = thin_border
-
-def format_suppliers(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border):
-    """Format Suppliers worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:J2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Data table header
-    for col in range(1, 11):  # A to J
-        cell = ws.cell(row=4, column=col)
-        if cell.value:
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.border = thin_border
-    
-    # Data rows
-    for row in range(6, 10):  # Data rows
-        for col in range(1, 11):
-            cell = ws.cell(row=row, column=col)
-            if cell.value:
-                cell.font = body_font
-                cell.border = thin_border
-
-def format_products(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border):
-    """Format Products worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:N2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Data table header
-    for col in range(1, 15):  # A to N
-        cell = ws.cell(row=4, column=col)
-        if cell.value:
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.border = thin_border
-    
-    # Data rows
-    for row in range(6, 16):  # Data rows
-        for col in range(1, 15):
-            cell = ws.cell(row=row, column=col)
-            if cell.value:
-                cell.font = body_font
-                cell.border = thin_border
-
-def format_inventory(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border):
-    """Format Inventory worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:O2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Data table header
-    for col in range(1, 16):  # A to O
-        cell = ws.cell(row=4, column=col)
-        if cell.value:
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.border = thin_border
-    
-    # Data rows with status coloring
-    for row in range(6, 16):  # Data rows
-        for col in range(1, 16):
-            cell = ws.cell(row=row, column=col)
-            if cell.value:
-                cell.font = body_font
-                cell.border = thin_border
-                
-                # Color code status column
-                if col == 6:  # Status column
-                    if '🟢' in str(cell.value) or 'Healthy' in str(cell.value):
-                        cell.fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-                    elif '🟡' in str(cell.value) or 'Low Stock' in str(cell.value) or 'At Minimum' in str(cell.value):
-                        cell.fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-                    elif '🔴' in str(cell.value) or 'Out of Stock' in str(cell.value):
-                        cell.fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
+    return {
+        "title": {"font": title_font, "fill": header_fill, "alignment": Alignment(horizontal='center', vertical='center')},
+        "section": {"font": subheader_font, "fill": subheader_fill},
+        "table_header": {"font": subheader_font, "fill": subheader_fill, "border": thin_border},
+        "data": {"font": body_font, "border": thin_border},
+        **status_styles(),
+    }
 
-def format_quickadd(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border):
-    """Format QuickAdd worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:H2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Section headers
-    section_headers = ['A4', 'A11', 'A24']
-    for cell_addr in section_headers:
-        cell = ws[cell_addr]
-        if cell.value:
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-
-def format_reorder(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border):
-    """Format Reorder worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:J2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Data table headers
-    for col in range(1, 11):  # A to J
-        cell = ws.cell(row=6, column=col)
-        if cell.value:
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.border = thin_border
-    
-    # Priority coloring in reorder table
-    for row in range(8, 12):  # Data rows
-        priority_cell = ws.cell(row=row, column=9)  # Priority column
-        if priority_cell.value:
-            if '🔴' in str(priority_cell.value) or 'URGENT' in str(priority_cell.value):
-                for col in range(1, 11):
-                    ws.cell(row=row, column=col).fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
-            elif '🟡' in str(priority_cell.value) or 'MEDIUM' in str(priority_cell.value):
-                for col in range(1, 11):
-                    ws.cell(row=row, column=col).fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-
-def format_analytics(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, success_fill, warning_fill, critical_fill, thin_border):
-    """Format Analytics worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:J2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Section headers
-    section_headers = ['A4', 'A12', 'A22', 'A31', 'A38', 'A46', 'A54', 'A64', 'A72']
-    for cell_addr in section_headers:
-        cell = ws[cell_addr]
-        if cell.value:
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-
-def format_instructions(ws, header_font, subheader_font, body_font, header_fill, subheader_fill, thin_border):
-    """Format Instructions worksheet"""
-    
-    # Main header
-    ws['A2'].font = Font(name='Arial', size=16, bold=True, color=BeautyProColors.DEEP_CHARCOAL)
-    ws['A2'].fill = header_fill
-    ws.merge_cells('A2:J2')
-    ws['A2'].alignment = Alignment(horizontal='center', vertical='center')
-    
-    # Section headers
-    for row in ws.iter_rows():
-        for cell in row:
-            if cell.value and ('🎯' in str(cell.value) or '📱' in str(cell.value) or '🔧' in str(cell.value) or '🎨' in str(cell.value) or '🆘' in str(cell.value) or '📞' in str(cell.value)):
-                cell.font = subheader_font
-                cell.fill = subheader_fill
-
-def adjust_column_widths(ws):
-    """Auto-adjust column widths based on content"""
+def format_worksheet(ws, sheet_name):
+    """Apply professional formatting to worksheet"""
     
-    for column in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        
-        adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-        ws.column_dimensions[column_letter].width = adjusted_width
+    # Title, table, status colours, section headers and column widths come from the sheet's layout spec
+    return format_with_layout(ws, sheet_name, worksheet_styles())
 
-def add_formulas_and_validation(wb):
-    """Add Excel formulas and basic validation"""
-    
-    # Add some basic formulas to Products sheet for margin calculation
-    products_ws = wb["Products"]
+def write_margins(products_ws):
+    """Margin % text in column H of each Products row with both a cost and a retail price"""
     
     # Add margin calculation formula to existing products
-    for row in range(6, 16):  # Product data rows
+    for row in compile_layout(products_ws, LAYOUTS["Products"]).data_rows:
         cost_col = 6  # F column (Cost)
         price_col = 7  # G column (Retail Price) 
         margin_col = 8  # H column (Margin %)
@@ -13,6 +13,13 @@ import os
 import csv
 from datetime import datetime, timedelta
 
+from analytics_rollups import (PERFORMANCE_TITLE, CATEGORY_TITLE, CATEGORY_HEADERS, load_default_rollups,
+                               performance_rows, category_rows)
+from inventory_metrics import add_inventory_metrics
+from demand_forecast import apply_reorder_plan
+from sheet_layouts import format_with_layout, status_styles
+from workbook_io import save_workbook
+
 # Beauty Pro Color Scheme
 class Colors:
     DEEP_CHARCOAL = "2C3E50"
@@ -39,6 +46,9 @@ def create_final_workbook():
     # Create named styles
     create_named_styles(wb)
     
+    # Sales rollups, with the QuickAdd history of the sample sheets folded in
+    rollups = load_default_rollups("/home/grig/Projects/inventory_template/sheets/")
+    
     # Sheet creation order
     sheets_info = [
         ("Dashboard", create_dashboard_data),
@@ -48,7 +58,7 @@ def create_final_workbook():
         ("Inventory", create_inventory_data),
         ("QuickAdd", create_quickadd_data),
         ("Reorder", create_reorder_data),
-        ("Analytics", create_analytics_data),
+        ("Analytics", lambda ws: create_analytics_data(ws, rollups)),
         ("Instructions", create_instructions_data)
     ]
     
@@ -58,9 +68,15 @@ def create_final_workbook():
         data_func(ws)
         format_sheet(ws, sheet_name)
     
+    # Turnover, days of supply and ABC classes from the sales history
+    add_inventory_metrics(wb, rollups)
+    
+    # Order quantities from the demand forecast over each supplier's lead time
+    apply_reorder_plan(wb, rollups)
+    
     # Save final workbook
     output_path = "/home/grig/Projects/inventory_template/Beauty_Pro_Inventory_System_FINAL.xlsx"
-    wb.save(output_path)
+    save_workbook(wb, output_path)
     print(f"Final Excel workbook saved to: {output_path}")
     
     return output_path
@@ -106,7 +122,7 @@ def create_dashboard_data(ws):
         ("Total Products", 142, "Low Stock Items", 23),
         ("Inventory Value", "$12,847", "Expiring Soon", 5),
         ("Avg Profit Margin", "47.2%", "Stock-out Rate", "6.4%"),
-        ("Inventory Turnover", "4.2x", "Expiry Risk Value", "$125")
+        ("Inventory Turnover", "--", "Expiry Risk Value", "$125")
     ]
     
     for i, (metric1, value1, metric2, value2) in enumerate(metrics, 6):
@@ -346,28 +362,44 @@ def create_reorder_data(ws):
         for col_idx, value in enumerate(row_data, 1):
             ws.cell(row=row_idx, column=col_idx, value=value).style = "data"
 
-def create_analytics_data(ws):
-    """Create Analytics worksheet"""
+def create_analytics_data(ws, rollups):
+    """Create Analytics worksheet from the materialized sales rollups"""
     
     ws['A1'] = "📈 BUSINESS ANALYTICS"
     ws['A1'].style = "header"
     ws.merge_cells('A1:J1')
     
     # Performance Dashboard
-    ws['A3'] = "📊 PERFORMANCE DASHBOARD"
+    ws['A3'] = PERFORMANCE_TITLE
     ws['A3'].style = "subheader"
     
-    performance_data = [
-        ["Current Month", "January 2024", "", "Previous Month", "December 2023", "", "Growth", "+12.5%"],
-        ["Total Revenue", "$18,470", "", "Total Revenue", "$16,420", "", "Revenue Growth", "+$2,050"],
-        ["Total Profit", "$8,730", "", "Total Profit", "$7,890", "", "Profit Growth", "+$840"],
-        ["Profit Margin", "47.3%", "", "Profit Margin", "48.1%", "", "Margin Change", "-0.8%"],
-        ["Units Sold", 245, "", "Units Sold", 218, "", "Volume Growth", "+27 units"]
-    ]
+    performance_data = performance_rows(rollups)
+    if performance_data is None:
+        # No sales history recorded yet - show the sample figures
+        performance_data = [
+            ["Current Month", "January 2024", "", "Previous Month", "December 2023", "", "Growth", "+12.5%"],
+            ["Total Revenue", "$18,470", "", "Total Revenue", "$16,420", "", "Revenue Growth", "+$2,050"],
+            ["Total Profit", "$8,730", "", "Total Profit", "$7,890", "", "Profit Growth", "+$840"],
+            ["Profit Margin", "47.3%", "", "Profit Margin", "48.1%", "", "Margin Change", "-0.8%"],
+            ["Units Sold", 245, "", "Units Sold", 218, "", "Volume Growth", "+27 units"]
+        ]
     
     for row_idx, row_data in enumerate(performance_data, 5):
         for col_idx, value in enumerate(row_data, 1):
             ws.cell(row=row_idx, column=col_idx, value=value).style = "data"
+    
+    # Category Performance for the current month
+    category_data = category_rows(rollups)
+    if category_data:
+        ws['A11'] = CATEGORY_TITLE
+        ws['A11'].style = "subheader"
+        
+        for i, header in enumerate(CATEGORY_HEADERS, 1):
+            ws.cell(row=13, column=i, value=header).style = "subheader"
+        
+        for row_idx, row_data in enumerate(category_data, 14):
+            for col_idx, value in enumerate(row_data, 1):
+                ws.cell(row=row_idx, column=col_idx, value=value).style = "data"
 
 def create_instructions_data(ws):
     """Create Instructions worksheet"""
@@ -413,21 +445,6 @@ def create_instructions_data(ws):
 def format_sheet(ws, sheet_name):
     """Apply formatting to each sheet"""
     
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
     # Add borders to data tables
     thin_border = Border(
         left=Side(style='thin', color=Colors.LIGHT_BORDER),
@@ -436,11 +453,13 @@ def format_sheet(ws, sheet_name):
         bottom=Side(style='thin', color=Colors.LIGHT_BORDER)
     )
     
-    # Apply borders to data ranges (this is simplified)
-    for row in ws.iter_rows():
-        for cell in row:
-            if cell.value and cell.row > 2:  # Skip title rows
-                cell.border = thin_border
+    # Titles, sections and table cells already carry named styles; the layout spec adds status colours,
+    # borders on every filled cell below the title rows and column widths of at least 6
+    styles = {
+        "values": {"border": thin_border},
+        **status_styles(),
+    }
+    format_with_layout(ws, sheet_name, styles, merge=False, values_from_row=3, min_width=6)
 
 if __name__ == "__main__":
     output_file = create_final_workbook()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Snapshot Diff
+Compares two workbooks or sheet CSVs row by row and reports added, removed and changed rows.
+Rows are matched by their record key (SKU or Product Name) and compared by hash, so only the deltas are kept in memory.
+"""
+
+import hashlib
+import os
+import sys
+
+from import_workbook import iter_records
+from inventory_model import RECORD_TYPES
+
+class RowChange:
+    """One added, removed or changed row between two snapshots"""
+
+    def __init__(self, kind, key, old=None, new=None):
+        self.kind = kind
+        self.key = key
+        self.old = old
+        self.new = new
+        self.deltas = column_deltas(old, new) if kind == "changed" else {}
+
+    def as_dict(self):
+        """Plain dictionary for JSON notifications"""
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "old": dict(zip(self.old.fields(), self.old.to_row())) if self.old else None,
+            "new": dict(zip(self.new.fields(), self.new.to_row())) if self.new else None,
+            "deltas": {attr: list(delta) for attr, delta in self.deltas.items()},
+        }
+
+    def __repr__(self):
+        return f"RowChange({self.kind!r}, {self.key!r}, deltas={self.deltas!r})"
+
+def row_digest(record):
+    """Short stable hash of a row's values"""
+    return hashlib.blake2b(repr(record.to_row()).encode('utf-8'), digest_size=8).digest()
+
+def column_deltas(old, new):
+    """Per-column (old, new, difference) for every column that changed"""
+    deltas = {}
+    for attr, old_value, new_value in zip(old.fields(), old.to_row(), new.to_row()):
+        if old_value == new_value:
+            continue
+        difference = None
+        if isinstance(old_value, (int, float)) and isinstance(new_value, (int, float)):
+            difference = new_value - old_value
+        deltas[attr] = (old_value, new_value, difference)
+    return deltas
+
+def iter_keyed_records(path, record_cls):
+    """Yield (key, record) for one table, numbering repeats of a key ("key#2") so equal rows stay distinct"""
+    # Two identical sales on one day share a Transaction key; matching them by occurrence diffs them as a multiset
+    counts = {}
+    for record in iter_records(path, record_cls):
+        key = record.key()
+        if key is None:
+            continue
+        counts[key] = counts.get(key, 0) + 1
+        yield (key if counts[key] == 1 else f"{key}#{counts[key]}"), record
+
+def diff_tables(old_path, new_path, record_cls):
+    """Yield RowChange objects for one table, streaming both snapshots"""
+
+    # Pass 1: remember only a hash per key of the old snapshot
+    old_digests = {}
+    for key, record in iter_keyed_records(old_path, record_cls):
+        old_digests[key] = row_digest(record)
+
+    # Pass 2: stream the new snapshot, keeping only rows that changed
+    changed = {}
+    for key, record in iter_keyed_records(new_path, record_cls):
+        old_digest = old_digests.pop(key, None)
+        if old_digest is None:
+            yield RowChange("added", key, new=record)
+        elif old_digest != row_digest(record):
+            changed[key] = record
+
+    # Pass 3: fetch old values for removed and changed rows only
+    if not old_digests and not changed:
+        return
+    for key, record in iter_keyed_records(old_path, record_cls):
+        if key in old_digests:
+            yield RowChange("removed", key, old=record)
+        elif key in changed:
+            yield RowChange("changed", key, old=record, new=changed.pop(key))
+
+def diff_snapshots(old_path, new_path, sheets=None):
+    """Diff every known table of two snapshots, returning changes keyed by sheet name"""
+    if sheets is None:
+        if old_path.lower().endswith('.csv'):
+            sheets = [os.path.splitext(os.path.basename(new_path))[0]]
+        else:
+            sheets = list(RECORD_TYPES)
+    return {sheet_name: list(diff_tables(old_path, new_path, RECORD_TYPES[sheet_name])) for sheet_name in sheets}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: diff_snapshots.py OLD NEW [SHEET...]")
+        sys.exit(1)
+    results = diff_snapshots(sys.argv[1], sys.argv[2], sys.argv[3:] or None)
+    for sheet_name, changes in results.items():
+        print(f"{sheet_name}: {len(changes)} changes")
+        for change in changes:
+            if change.kind == "changed":
+                details = ", ".join(f"{attr} {old!r} -> {new!r}" for attr, (old, new, _) in change.deltas.items())
+                print(f"  ~ {change.key}: {details}")
+            else:
+                print(f"  {'+' if change.kind == 'added' else '-'} {change.key}")
@@ -2,36 +2,68 @@
 """
 Beauty Pro Inventory System - Excel Workbook Enhancer
 Adds advanced features, formulas, and functionality to the Excel workbook.
+The enhancements run as selectable stages on the workbook built in memory, which is saved once.
 """
 
 import openpyxl
+import sys
+from copy import copy
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill
 from datetime import datetime, timedelta
 
-def enhance_workbook():
-    """Add advanced features to the Excel workbook"""
+from analytics_rollups import load_default_rollups, load_workbook_rollups, performance_rows, analytics_edits
+from create_excel_workbook import build_workbook
+from demand_forecast import total_order_value_cell
+from sheet_layouts import LAYOUTS, compile_layout, format_with_layout, status_styles
+from workbook_io import save_workbook
+
+def enhance_workbook(stages=None):
+    """Build the workbook from the sheet CSVs and enhance it in memory, saving once"""
     
-    # Load the existing workbook
-    wb_path = "/home/grig/Projects/inventory_template/Beauty_Pro_Inventory_System.xlsx"
-    wb = openpyxl.load_workbook(wb_path)
+    # One sales rollup store, synced with these sheets, serves the build and the enhancements
+    sheets_dir = "/home/grig/Projects/inventory_template/sheets/"
+    rollups = load_default_rollups(sheets_dir)
+    wb = build_workbook(sheets_dir, rollups=rollups)
     
     print("Enhancing Excel workbook with advanced features...")
-    
-    # Enhance each worksheet
-    enhance_dashboard(wb)
-    enhance_products(wb)
-    enhance_inventory(wb)
-    enhance_reorder(wb)
-    enhance_analytics(wb)
+    apply_enhancements(wb, stages, rollups)
     
     # Save enhanced workbook
     output_path = "/home/grig/Projects/inventory_template/Beauty_Pro_Inventory_System_Enhanced.xlsx"
-    wb.save(output_path)
+    save_workbook(wb, output_path)
     print(f"Enhanced workbook saved to: {output_path}")
     
     return output_path
 
+def enhance_saved_workbook(wb_path, output_path, stages=None):
+    """Enhance a workbook already on disk, such as one edited by hand"""
+    
+    wb = openpyxl.load_workbook(wb_path)
+    apply_enhancements(wb, stages)
+    save_workbook(wb, output_path)
+    return output_path
+
+def apply_enhancements(wb, stages=None, rollups=None):
+    """Run the selected enhancement stages (all of them by default) in pipeline order
+    
+    rollups is the sales rollup store the workbook was built from; without one, the analytics stage
+    loads the default store and syncs it with the workbook's QuickAdd sheet.
+    """
+    
+    selected = list(ENHANCEMENT_STAGES) if stages is None else list(stages)
+    unknown = [stage for stage in selected if stage not in ENHANCEMENT_STAGES]
+    if unknown:
+        raise ValueError(f"Unknown enhancement stage(s) {', '.join(unknown)}, expected one of {', '.join(ENHANCEMENT_STAGES)}")
+    
+    for stage, enhance in ENHANCEMENT_STAGES.items():
+        if stage not in selected:
+            continue
+        if stage == "analytics":
+            enhance(wb, rollups)
+        else:
+            enhance(wb)
+
 def enhance_dashboard(wb):
     """Add dynamic calculations to Dashboard"""
     
@@ -47,7 +79,7 @@ def enhance_dashboard(wb):
     ws['D6'] = 142  # Total Products
     ws['D7'] = "$12,847"  # Inventory Value
     ws['D8'] = "47.2%"  # Avg Profit Margin
-    ws['D9'] = "4.2x"  # Inventory Turnover
+    # Inventory Turnover (B9) is written from the sales history when the workbook is built
     
     ws['F6'] = 23  # Low Stock Items
     ws['F7'] = 5   # Expiring Soon
@@ -59,8 +91,10 @@ def enhance_products(wb):
     
     ws = wb["Products"]
     
+    data_rows = compile_layout(ws, LAYOUTS["Products"]).data_rows
+    
     # Add margin calculation formulas for each product row
-    for row in range(6, 16):
+    for row in data_rows:
         cost_cell = f"F{row}"
         retail_cell = f"G{row}"
         margin_cell = f"H{row}"
@@ -71,13 +105,14 @@ def enhance_products(wb):
             formula = f"=IF(AND(NOT(ISBLANK({cost_cell})),NOT(ISBLANK({retail_cell})),(G{row}>0)),(({retail_cell}-{cost_cell})/{retail_cell})*100,\"\")"
             ws[margin_cell] = formula
     
-    # Add total value formulas
-    ws['A37'] = "TOTALS:"
-    ws['A37'].font = Font(bold=True)
-    
-    # Add some sample totals (these would be calculated from actual data)
-    ws['B37'] = "=COUNTA(A6:A15)"  # Count of products
-    ws['C37'] = "=AVERAGE(H6:H15)"  # Average margin
+    # Add total value formulas below the table, leaving a blank row so the table still ends there
+    if data_rows:
+        first, last = data_rows.start, data_rows.stop - 1
+        totals_row = last + 2
+        ws[f'A{totals_row}'] = "TOTALS:"
+        ws[f'A{totals_row}'].font = Font(bold=True)
+        ws[f'B{totals_row}'] = f"=COUNTA(A{first}:A{last})"  # Count of products
+        ws[f'C{totals_row}'] = f"=AVERAGE(H{first}:H{last})"  # Average margin
     
 def enhance_inventory(wb):
     """Add dynamic status and reorder calculations to Inventory"""
@@ -85,7 +120,7 @@ def enhance_inventory(wb):
     ws = wb["Inventory"]
     
     # Add status formulas for each inventory item
-    for row in range(6, 16):
+    for row in compile_layout(ws, LAYOUTS["Inventory"]).data_rows:
         current_stock_cell = f"B{row}"
         min_stock_cell = f"C{row}"
         status_cell = f"F{row}"
@@ -107,6 +142,9 @@ def enhance_inventory(wb):
             else:
                 ws[status_cell] = "🟢 Healthy"
                 ws[action_cell] = "Continue"
+    
+    # Recolour the status column for the new values
+    format_with_layout(ws, "Inventory", status_styles(), merge=False, widths=False)
 
 def enhance_reorder(wb):
     """Add priority and cost calculations to Reorder sheet"""
@@ -115,7 +153,8 @@ def enhance_reorder(wb):
     
     # Calculate total order value
     total_cost = 0
-    for row in range(8, 12):
+    data_rows = compile_layout(ws, LAYOUTS["Reorder"]).data_rows
+    for row in data_rows:
         cost_cell = f"H{row}"
         if ws[cost_cell].value:
             try:
@@ -124,35 +163,63 @@ def enhance_reorder(wb):
             except:
                 pass
     
-    # Update total in summary
-    ws['E15'] = f"${total_cost:,.2f}"
+    # Update total in summary, next to its label below the table
+    total_cell = total_order_value_cell(ws, data_rows.stop if data_rows else 1)
+    if total_cell is not None:
+        total_cell.value = f"${total_cost:,.2f}"
 
-def enhance_analytics(wb):
+def enhance_analytics(wb, rollups=None):
     """Add calculated metrics to Analytics sheet"""
     
     ws = wb["Analytics"]
     
-    # Add current month data
-    current_month = datetime.now().strftime("%B %Y")
-    ws['B6'] = current_month
-    
-    # Add some sample growth calculations
-    ws['G6'] = "+12.5%"
-    ws['G7'] = "+$2,050"
-    ws['G8'] = "+$840"
-    ws['G9'] = "-0.8%"
-    ws['G10'] = "+27 units"
+    if rollups is None:
+        rollups = load_workbook_rollups(wb)
+    if performance_rows(rollups) is not None:
+        # Month-over-month and category figures from the materialized sales rollups
+        write_analytics_sections(ws, rollups)
+    else:
+        # Add current month data
+        current_month = datetime.now().strftime("%B %Y")
+        ws['B6'] = current_month
+        
+        # Add some sample growth calculations
+        ws['G6'] = "+12.5%"
+        ws['G7'] = "+$2,050"
+        ws['G8'] = "+$840"
+        ws['G9'] = "-0.8%"
+        ws['G10'] = "+27 units"
     
     # Color code performance indicators
-    for row in range(49, 53):
-        status_cell = f"D{row}"
-        if ws[status_cell].value:
-            if "🟢" in str(ws[status_cell].value):
-                ws[status_cell].fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")
-            elif "🟡" in str(ws[status_cell].value):
-                ws[status_cell].fill = PatternFill(start_color="FFF3CD", end_color="FFF3CD", fill_type="solid")
-            elif "🔴" in str(ws[status_cell].value):
-                ws[status_cell].fill = PatternFill(start_color="F8D7DA", end_color="F8D7DA", fill_type="solid")
+    format_with_layout(ws, "Analytics", status_styles(), merge=False, widths=False)
+
+def write_analytics_sections(ws, rollups):
+    """Rewrite the performance and category sections in place, adding or removing rows for the categories"""
+    rows = [list(row) for row in ws.iter_rows(values_only=True)]
+    width = ws.max_column
+    for start, stop, new_rows in analytics_edits(rows, rollups):
+        extra = len(new_rows) - (stop - start)
+        if extra > 0:
+            # New rows take the formatting of the last row of the section
+            ws.insert_rows(stop + 1, extra)
+            for row in range(stop + 1, stop + 1 + extra):
+                for col in range(1, width + 1):
+                    ws.cell(row=row, column=col)._style = copy(ws.cell(row=stop, column=col)._style)
+        elif extra < 0:
+            ws.delete_rows(start + 1 + len(new_rows), -extra)
+        for row_idx, row_data in enumerate(new_rows, start + 1):
+            for col_idx in range(1, max(width, len(row_data)) + 1):
+                value = row_data[col_idx - 1] if col_idx <= len(row_data) else None
+                ws.cell(row=row_idx, column=col_idx, value=value if value != "" else None)
+
+# Enhancement stages in the order they run
+ENHANCEMENT_STAGES = {
+    "dashboard": enhance_dashboard,
+    "products": enhance_products,
+    "inventory": enhance_inventory,
+    "reorder": enhance_reorder,
+    "analytics": enhance_analytics,
+}
 
 def add_summary_sheet(wb):
     """Add a summary sheet with key metrics"""
@@ -201,5 +268,6 @@ def add_summary_sheet(wb):
 
 if __name__ == "__main__":
     print("Enhancing Beauty Pro Inventory System...")
-    enhanced_file = enhance_workbook()
+    # Optional stage names select which enhancements run, e.g. "inventory reorder"
+    enhanced_file = enhance_workbook(sys.argv[1:] or None)
     print(f"Enhancement complete: {enhanced_file}")
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Table Exporters
+Writes the Products, Inventory and Reorder tables as CSV, JSON Lines or Parquet straight from the data model,
+so machine consumers (BI, POS sync, storefront) don't have to parse the styled workbook.
+"""
+
+import csv
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+
+from inventory_model import RECORD_TYPES, ColumnarTable, NumberColumn, IntColumn, DateColumn, CategoricalColumn, INT_NULL, DATE_NULL
+from parallel_csv import parse_csv_table
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXPORT_SHEETS = ("Products", "Inventory", "Reorder")
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+FILE_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+
+def plain_value(value):
+    """Machine-friendly cell value: ISO dates, no NaN"""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def write_csv(records, record_cls, output_path):
+    """Stream records to a plain CSV with the sheet headers"""
+    with open(output_path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(record_cls.headers())
+        for record in records:
+            writer.writerow(["" if value is None else plain_value(value) for value in record.to_row()])
+
+def write_jsonl(records, record_cls, output_path):
+    """Stream records as one JSON object per line, keyed by field name"""
+    fields = record_cls.fields()
+    with open(output_path, 'w', encoding='utf-8') as file:
+        for record in records:
+            file.write(json.dumps(dict(zip(fields, map(plain_value, record.to_row()))), ensure_ascii=False))
+            file.write("\n")
+
+def arrow_column(column):
+    """Convert one ColumnarTable column to an Arrow array, reusing its buffers where possible"""
+    if isinstance(column, NumberColumn):
+        values = np.frombuffer(column.values, dtype=np.float64)
+        return pa.array(values, mask=np.isnan(values))
+    if isinstance(column, IntColumn):
+        values = np.frombuffer(column.values, dtype=np.int32)
+        return pa.array(values, mask=values == INT_NULL)
+    if isinstance(column, DateColumn):
+        # Arrow dates count days from 1970-01-01
+        ordinals = np.frombuffer(column.values, dtype=np.int32)
+        days = ordinals - date(1970, 1, 1).toordinal()
+        return pa.array(days, type=pa.int32(), mask=ordinals == DATE_NULL).cast(pa.date32())
+    if isinstance(column, CategoricalColumn):
+        codes = np.frombuffer(column.codes, dtype=np.dtype(column.codes.typecode)).astype(np.int32)
+        indices = pa.array(codes - 1, mask=codes == 0)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(column.categories[1:], type=pa.string()))
+    return pa.array([column.get(pos) for pos in range(len(column.offsets) - 1)], type=pa.string())
+
+def write_parquet(records, record_cls, output_path):
+    """Write records as a Parquet file via their columnar representation"""
+    if pa is None:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+    table = records if isinstance(records, ColumnarTable) else ColumnarTable(record_cls, records)
+    arrow_table = pa.table({attr: arrow_column(column) for attr, column in table.columns.items()})
+    pq.write_table(arrow_table, output_path, compression="zstd")
+
+WRITERS = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+    "parquet": write_parquet,
+}
+
+def export_records(records, sheet_name, fmt, output_dir):
+    """Export records already in memory as one table in one format, returning the written path"""
+    record_cls = RECORD_TYPES[sheet_name]
+    output_path = os.path.join(output_dir, sheet_name.lower() + FILE_EXTENSIONS[fmt])
+    tmp_path = output_path + ".tmp"
+    WRITERS[fmt](records, record_cls, tmp_path)
+    # Consumers polling the export directory only ever see complete files
+    os.replace(tmp_path, output_path)
+    return output_path
+
+def export_table(source, sheet_name, fmt, output_dir):
+    """Export one table, given as its sheet CSV or an already built ColumnarTable, returning the written path"""
+    if not isinstance(source, ColumnarTable):
+        # Already running in a pool worker, so the CSV is parsed in-process
+        source = parse_csv_table(source, RECORD_TYPES[sheet_name], workers=1)
+    return export_records(source, sheet_name, fmt, output_dir)
+
+def table_source(source, sheet_name):
+    """Sheet CSV inside a directory, or the table itself from a dict of ColumnarTables by sheet name"""
+    if isinstance(source, dict):
+        return source[sheet_name]
+    return os.path.join(source, f"{sheet_name}.csv")
+
+def start_exports(source, output_dir, sheets=EXPORT_SHEETS, formats=EXPORT_FORMATS, pool=None):
+    """Submit every (table, format) export to a process pool, returning the pool and its futures"""
+    os.makedirs(output_dir, exist_ok=True)
+    if "parquet" in formats and pa is None:
+        print("pyarrow not installed - skipping Parquet exports")
+        formats = [fmt for fmt in formats if fmt != "parquet"]
+    pool = pool or ProcessPoolExecutor()
+    futures = [pool.submit(export_table, table_source(source, sheet_name), sheet_name, fmt, output_dir)
+               for sheet_name in sheets for fmt in formats]
+    return pool, futures
+
+if __name__ == "__main__":
+    # Build the workbook and export the machine-readable tables side by side
+    from create_excel_workbook import create_excel_workbook
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, "sheets")
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, "exports")
+
+    start = time.perf_counter()
+    pool, futures = start_exports(source, output_dir)
+    with pool:
+        create_excel_workbook()
+        for future in futures:
+            print(f"Exported {future.result()}")
+    print(f"Build and exports finished in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Synthetic Catalog Generator
+Generates seeded, reproducible Categories, Suppliers, Products, Inventory, Reorder and QuickAdd sales-history
+sheet CSVs at any scale, with skewed prices, stock levels and expiry dates and consistent references between tables.
+"""
+
+import csv
+import numpy as np
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+from inventory_model import Category, Supplier, Product, InventoryItem, ReorderItem, Transaction
+
+# Generated data ends on this day so the same seed always gives the same files
+END_DATE = date(2024, 1, 15)
+
+# (name, description, target margin %, reorder days) of the sample categories, extended with numbered ones at scale
+SAMPLE_CATEGORIES = [
+    ("Lipstick", "Lip colors and treatments", 45, 14),
+    ("Foundation", "Base makeup products", 50, 21),
+    ("Skincare", "Cleansers serums moisturizers", 40, 30),
+    ("Fragrance", "Perfumes and body sprays", 35, 45),
+    ("Eye Makeup", "Eyeshadows mascara eyeliner", 42, 18),
+    ("Nail Care", "Nail polish and treatments", 38, 25),
+]
+SAMPLE_BRANDS = ["MAC", "Fenty Beauty", "The Ordinary", "Chanel", "Urban Decay", "OPI", "Rare Beauty",
+                 "Drunk Elephant", "Charlotte Tilbury", "Glossier"]
+PRODUCT_LINES = ["Classic", "Matte", "Glow", "Velvet", "Hydra", "Pro", "Silk", "Luxe", "Pure", "Radiant"]
+LEAD_TIMES = [7, 14, 18, 21, 28, 35]
+PAYMENT_TERMS = ["Net 30", "Net 45", "Net 60", "COD"]
+RATINGS = ["⭐⭐⭐", "⭐⭐⭐⭐", "⭐⭐⭐⭐⭐"]
+# Relative sales by weekday, Monday first, peaking on Saturday
+WEEKDAY_SALES = np.array([0.8, 0.85, 0.9, 1.0, 1.2, 1.5, 1.1])
+
+SHEET_TITLES = {
+    "Categories": "📂 MY CATEGORIES",
+    "Suppliers": "🏪 MY SUPPLIERS",
+    "Products": "💄 MY PRODUCTS",
+    "Inventory": "📦 LIVE INVENTORY",
+    "Reorder": "🔄 REORDER DASHBOARD",
+    "QuickAdd": "📋 RECENT TRANSACTIONS",
+}
+
+def zipf_choice(rng, count, size, exponent=1.0):
+    """Indices in range(count) drawn with probability falling off with rank"""
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return rng.choice(count, size=size, p=weights / weights.sum())
+
+def money(values):
+    return [f"${value:.2f}" for value in values.tolist()]
+
+def percent(values):
+    return [f"{value}%" for value in values.tolist()]
+
+def iso_dates(days_before_end):
+    """ISO date strings for offsets back from END_DATE"""
+    ordinals = END_DATE.toordinal() - np.asarray(days_before_end)
+    cache = {}
+    return [cache.get(ordinal) or cache.setdefault(ordinal, date.fromordinal(ordinal).isoformat()) for ordinal in ordinals.tolist()]
+
+class Catalog:
+    """Column arrays for every generated table, consistent with one another"""
+
+    def __init__(self, products=10000, categories=12, suppliers=None, seed=0):
+        rng = np.random.default_rng(seed)
+        self.rng = rng
+
+        # Categories
+        n_categories = max(categories, len(SAMPLE_CATEGORIES))
+        extra = n_categories - len(SAMPLE_CATEGORIES)
+        self.category_names = [row[0] for row in SAMPLE_CATEGORIES] + [f"Category {i}" for i in range(len(SAMPLE_CATEGORIES) + 1, n_categories + 1)]
+        self.category_descriptions = [row[1] for row in SAMPLE_CATEGORIES] + [f"Generated category {i}" for i in range(len(SAMPLE_CATEGORIES) + 1, n_categories + 1)]
+        self.category_margin = np.concatenate([[row[2] for row in SAMPLE_CATEGORIES], rng.integers(30, 56, extra)])
+        self.category_reorder_days = np.concatenate([[row[3] for row in SAMPLE_CATEGORIES], rng.integers(10, 46, extra)])
+        category_base_cost = rng.lognormal(np.log(14), 0.5, n_categories)
+
+        # Suppliers: each serves one category, and every category has at least one supplier
+        n_suppliers = max(suppliers or max(4, products // 2500), n_categories)
+        self.supplier_names = [f"Beauty Wholesale {i:04d}" for i in range(1, n_suppliers + 1)]
+        self.supplier_category = np.arange(n_suppliers) % n_categories
+        self.supplier_lead_time = rng.choice(LEAD_TIMES, n_suppliers)
+        self.supplier_terms = rng.integers(0, len(PAYMENT_TERMS), n_suppliers)
+        self.supplier_rating = rng.choice(len(RATINGS), n_suppliers, p=[0.2, 0.45, 0.35])
+        self.supplier_last_order = rng.geometric(0.1, n_suppliers)
+
+        # Products: popular categories and brands hold most of the catalog
+        self.category = zipf_choice(rng, n_categories, products, 0.8)
+        # Suppliers of category c are c, c + n_categories, c + 2 * n_categories, ...
+        supplier_counts = np.bincount(self.supplier_category, minlength=n_categories)
+        self.supplier = self.category + n_categories * (rng.random(products) * supplier_counts[self.category]).astype(np.int64)
+        n_brands = max(len(SAMPLE_BRANDS), products // 500)
+        self.brand_names = SAMPLE_BRANDS + [f"Brand {i}" for i in range(len(SAMPLE_BRANDS) + 1, n_brands + 1)]
+        self.brand = zipf_choice(rng, n_brands, products)
+        line = rng.integers(0, len(PRODUCT_LINES), products)
+
+        self.cost = np.maximum(np.round(category_base_cost[self.category] * rng.lognormal(0.0, 0.6, products), 2), 0.5)
+        margin = np.clip(self.category_margin[self.category] / 100.0 + rng.normal(0.0, 0.08, products), 0.1, 0.8)
+        self.retail = np.round(self.cost / (1.0 - margin), 2)
+        self.margin = np.round((self.retail - self.cost) / self.retail * 100).astype(np.int64)
+
+        # Daily demand is heavily skewed: a few bestsellers, a long tail of slow movers
+        self.daily_rate = rng.lognormal(-1.5, 1.2, products)
+        lead_time = self.supplier_lead_time[self.supplier]
+        self.min_stock = np.ceil(self.daily_rate * lead_time * 0.5).astype(np.int64) + 1
+        self.max_stock = self.min_stock * rng.integers(3, 6, products)
+        self.reorder_level = np.ceil(self.min_stock * 1.6).astype(np.int64)
+        self.stock = np.floor(self.max_stock * rng.beta(1.6, 1.2, products)).astype(np.int64)
+        self.stock[rng.random(products) < 0.03] = 0
+        # Mostly months of shelf life, with a small share already expired
+        self.days_to_expiry = (rng.gamma(2.0, 180.0, products) - 20).astype(np.int64)
+        self.last_updated = rng.geometric(0.3, products) - 1
+        shelf = rng.integers(1, 21, products)
+
+        brand_codes = ["".join(ch for ch in brand.upper() if ch.isalnum())[:5] for brand in self.brand_names]
+        self.names = np.array([f"{self.brand_names[b]} {PRODUCT_LINES[l]} {self.category_names[c]} {i}"
+                               for i, (b, l, c) in enumerate(zip(self.brand.tolist(), line.tolist(), self.category.tolist()), 1)], dtype=object)
+        self.skus = [f"{brand_codes[b]}-{i:07d}" for i, b in enumerate(self.brand.tolist(), 1)]
+        self.barcodes = [str(200000000000 + i) for i in range(products)]
+        self.locations = [f"Shelf {chr(65 + c % 26)}{s}" for c, s in zip(self.category.tolist(), shelf.tolist())]
+
+    def __len__(self):
+        return len(self.names)
+
+def open_sheet(output_dir, record_cls):
+    """Start a sheet CSV with its title and header rows, returning (file, writer)"""
+    file = open(os.path.join(output_dir, f"{record_cls.SHEET}.csv"), 'w', encoding='utf-8', newline='')
+    writer = csv.writer(file, lineterminator='\n')
+    writer.writerow([SHEET_TITLES[record_cls.SHEET]])
+    writer.writerow([])
+    writer.writerow(record_cls.headers())
+    return file, writer
+
+def write_sheet(output_dir, record_cls, columns):
+    """Write one sheet CSV from equal-length column lists, returning the row count"""
+    file, writer = open_sheet(output_dir, record_cls)
+    with file:
+        writer.writerows(zip(*columns))
+    return len(columns[0])
+
+def write_catalog(catalog, output_dir):
+    """Write the Categories, Suppliers, Products, Inventory and Reorder sheets, returning rows per sheet"""
+    os.makedirs(output_dir, exist_ok=True)
+    n_categories = len(catalog.category_names)
+    n_suppliers = len(catalog.supplier_names)
+    counts = {}
+
+    product_counts = np.bincount(catalog.category, minlength=n_categories)
+    counts["Categories"] = write_sheet(output_dir, Category, [
+        catalog.category_names, catalog.category_descriptions, percent(catalog.category_margin),
+        catalog.category_reorder_days.tolist(), ["✅ Active"] * n_categories, product_counts.tolist(),
+        [END_DATE.isoformat()] * n_categories, [""] * n_categories,
+    ])
+
+    supplier_ids = range(1, n_suppliers + 1)
+    counts["Suppliers"] = write_sheet(output_dir, Supplier, [
+        catalog.supplier_names, [f"Contact {i}" for i in supplier_ids], [f"orders@wholesale{i:04d}.com" for i in supplier_ids],
+        [f"(555) {i // 10000:03d}-{i % 10000:04d}" for i in supplier_ids], catalog.supplier_lead_time.tolist(),
+        [PAYMENT_TERMS[term] for term in catalog.supplier_terms.tolist()],
+        [catalog.category_names[category] for category in catalog.supplier_category.tolist()],
+        [RATINGS[rating] for rating in catalog.supplier_rating.tolist()],
+        iso_dates(catalog.supplier_last_order), [""] * n_suppliers,
+    ])
+
+    products = len(catalog)
+    names = catalog.names.tolist()
+    category_names = [catalog.category_names[category] for category in catalog.category.tolist()]
+    supplier_names = [catalog.supplier_names[supplier] for supplier in catalog.supplier.tolist()]
+    counts["Products"] = write_sheet(output_dir, Product, [
+        names, [catalog.brand_names[brand] for brand in catalog.brand.tolist()], category_names, catalog.skus,
+        supplier_names, money(catalog.cost), money(catalog.retail), percent(catalog.margin), catalog.barcodes,
+        iso_dates(-catalog.days_to_expiry), catalog.min_stock.tolist(), catalog.max_stock.tolist(),
+        catalog.locations, [""] * products,
+    ])
+
+    stock, min_stock, max_stock = catalog.stock, catalog.min_stock, catalog.max_stock
+    status = np.select([stock == 0, stock < min_stock, stock == min_stock],
+                       ["🔴 Out of Stock", "🔴 Low Stock", "🟡 At Minimum"], "🟢 Healthy")
+    action = np.select([stock < min_stock, stock == min_stock], ["ORDER NOW", "Consider Order"], "Continue")
+    counts["Inventory"] = write_sheet(output_dir, InventoryItem, [
+        names, stock.tolist(), min_stock.tolist(), max_stock.tolist(), catalog.reorder_level.tolist(), status.tolist(),
+        catalog.days_to_expiry.tolist(), iso_dates(catalog.last_updated), catalog.locations, money(catalog.cost),
+        money(catalog.retail), money(stock * catalog.cost), np.maximum(max_stock - stock, 0).tolist(),
+        supplier_names, action.tolist(),
+    ])
+
+    # Reorder: everything at or below minimum, most urgent first
+    rows = np.flatnonzero(stock <= min_stock)
+    rank = np.select([stock[rows] == 0, stock[rows] < min_stock[rows]], [0, 1], 2)
+    rows = rows[np.lexsort((stock[rows] / min_stock[rows], rank))]
+    rank = np.select([stock[rows] == 0, stock[rows] < min_stock[rows]], [0, 1], 2)
+    order_qty = max_stock[rows] - stock[rows]
+    counts["Reorder"] = write_sheet(output_dir, ReorderItem, [
+        catalog.names[rows].tolist(), stock[rows].tolist(), min_stock[rows].tolist(), max_stock[rows].tolist(),
+        order_qty.tolist(), [supplier_names[row] for row in rows.tolist()], money(catalog.cost[rows]),
+        money(order_qty * catalog.cost[rows]), np.array(["🔴 URGENT", "🔴 HIGH", "🟡 MEDIUM"])[rank].tolist(),
+        np.array(["ORDER NOW", "ORDER NOW", "Consider Order"])[rank].tolist(),
+    ])
+    return counts
+
+def write_sales_history(catalog, output_dir, days=365):
+    """Write QuickAdd sales and deliveries for the last days, newest first, ending at the current Inventory stock"""
+    rng = catalog.rng
+    # Walk back from today's stock: stock before a day = stock after it + units sold - units received
+    stock = catalog.stock.copy()
+    order_size = np.maximum(catalog.max_stock - catalog.min_stock, 1)
+    delivery_chance = np.minimum(catalog.daily_rate / order_size, 1.0)
+    rows = 0
+    file, writer = open_sheet(output_dir, Transaction)
+    with file:
+        for offset in range(days):
+            day = END_DATE - timedelta(days=offset)
+            sold = rng.poisson(catalog.daily_rate * WEEKDAY_SALES[day.weekday()])
+            received = np.where(rng.random(len(stock)) < delivery_chance, order_size, 0)
+            received[stock + sold - received < 0] = 0
+            stock_before = stock + sold - received
+            day_text = day.isoformat()
+
+            # Deliveries arrive before the day's sales, so each row's new stock chains onto the previous one
+            sales = np.flatnonzero(sold)
+            writer.writerows(zip([day_text] * len(sales), catalog.names[sales].tolist(),
+                                 [f"-{units}" for units in sold[sales].tolist()], ["Sale"] * len(sales),
+                                 stock[sales].tolist(), ["POS"] * len(sales)))
+            deliveries = np.flatnonzero(received)
+            writer.writerows(zip([day_text] * len(deliveries), catalog.names[deliveries].tolist(),
+                                 [f"+{units}" for units in received[deliveries].tolist()], ["Stock Received"] * len(deliveries),
+                                 (stock_before + received)[deliveries].tolist(), ["System"] * len(deliveries)))
+            rows += len(sales) + len(deliveries)
+            stock = stock_before
+    return rows
+
+def generate_catalog(output_dir, products=10000, days=365, seed=0, categories=12, suppliers=None):
+    """Generate every sheet CSV into output_dir, returning rows written per sheet"""
+    catalog = Catalog(products, categories, suppliers, seed)
+    counts = write_catalog(catalog, output_dir)
+    counts["QuickAdd"] = write_sales_history(catalog, output_dir, days)
+    return counts
+
+if __name__ == "__main__":
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    output_dir = sys.argv[3] if len(sys.argv) > 3 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated")
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else 0
+
+    start = time.perf_counter()
+    counts = generate_catalog(output_dir, products, days, seed)
+    elapsed = time.perf_counter() - start
+    for sheet_name, rows in counts.items():
+        print(f"{sheet_name}: {rows:,} rows")
+    total = sum(counts.values())
+    print(f"Wrote {total:,} rows to {output_dir} in {elapsed:.2f}s ({total / elapsed * 60 / 1e6:.1f}M rows/min)")
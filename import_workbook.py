@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Workbook Importer
+Streams user-edited workbooks (or the sheet CSVs) back into the in-memory data model.
+Tables are located by their header row, so rows added or moved by hand are still picked up.
+"""
+
+import openpyxl
+import csv
+import os
+import sys
+from itertools import islice
+
+from inventory_model import RECORD_TYPES, ColumnarTable
+
+def locate_header(row, record_cls):
+    """Return column positions for record_cls if row is its header row, else None"""
+    index = {}
+    for pos, value in enumerate(row):
+        if value is not None:
+            index.setdefault(str(value).strip(), pos)
+    if not all(header in index for header in record_cls.REQUIRED):
+        return None
+    return [index.get(header) for header in record_cls.headers()]
+
+def iter_table_rows(rows, record_cls):
+    """Yield (row number, raw row, column positions) for the data rows of the first record_cls table"""
+    positions = None
+    key_pos = None
+    started = False
+    for row_number, row in enumerate(rows, 1):
+        if positions is None:
+            positions = locate_header(row, record_cls)
+            if positions is not None:
+                key_pos = positions[0]
+            continue
+        key = row[key_pos] if key_pos < len(row) else None
+        if key is None or not str(key).strip():
+            # Blank spacer rows may sit between the header and the data,
+            # the first blank row after data ends the table
+            if started:
+                return
+            continue
+        started = True
+        yield row_number, row, positions
+
+def iter_numbered_records(rows, record_cls):
+    """Yield (row number, record) for the first record_cls table found in a stream of rows"""
+    for row_number, row, positions in iter_table_rows(rows, record_cls):
+        yield row_number, record_cls.from_row(row, positions)
+
+def iter_table_records(rows, record_cls):
+    """Yield records for the first record_cls table found in a stream of rows"""
+    for _, record in iter_numbered_records(rows, record_cls):
+        yield record
+
+def iter_table_values(rows, record_cls, attr):
+    """Yield one field of each record in the first record_cls table, converting only that column"""
+    field = record_cls.fields().index(attr)
+    convert = record_cls.COLUMNS[field][2]
+    for _, row, positions in iter_table_rows(rows, record_cls):
+        pos = positions[field]
+        yield convert(row[pos] if pos is not None and pos < len(row) else None)
+
+def common_ends(old_rows, new_rows):
+    """(prefix, suffix): how many rows both versions start and end with"""
+    shortest = min(len(old_rows), len(new_rows))
+    prefix = 0
+    while prefix < shortest and old_rows[prefix] == new_rows[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and old_rows[-1 - suffix] == new_rows[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+def update_numbered_records(numbered, old_rows, new_rows, record_cls):
+    """Re-read a table after its rows changed, parsing only the rows between the unchanged ends
+
+    numbered holds (row number, record) for old_rows. Returns the (row number, record) pairs for new_rows,
+    and the records of the changed rows that were removed and added.
+    """
+    prefix, suffix = common_ends(old_rows, new_rows)
+    kept = {}
+    # A changed header can move every column, so the records are only kept while it is unchanged
+    if any(locate_header(row, record_cls) is not None for row in islice(old_rows, prefix)):
+        kept = dict(numbered)
+    shift = len(old_rows) - len(new_rows)
+    updated, added = [], []
+    for row_number, row, positions in iter_table_rows(new_rows, record_cls):
+        if row_number <= prefix:
+            record = kept.get(row_number)
+        elif row_number > len(new_rows) - suffix:
+            record = kept.get(row_number + shift)
+        else:
+            record = None
+        if record is None:
+            record = record_cls.from_row(row, positions)
+            added.append(record)
+        updated.append((row_number, record))
+    reused = {id(record) for _, record in updated}
+    removed = [record for _, record in numbered if id(record) not in reused]
+    return updated, removed, added
+
+def locate_table(ws, record_cls):
+    """Find a table on an in-memory worksheet, returning (header row number, [(row number, record)])"""
+    rows = list(ws.iter_rows(values_only=True))
+    for row_number, row in enumerate(rows, 1):
+        if locate_header(row, record_cls) is not None:
+            return row_number, list(iter_numbered_records(rows, record_cls))
+    return None, []
+
+def iter_workbook_records(wb, record_cls):
+    """Stream records of one table from an already opened workbook"""
+    if record_cls.SHEET not in wb.sheetnames:
+        return
+    yield from iter_table_records(wb[record_cls.SHEET].iter_rows(values_only=True), record_cls)
+
+def iter_sheet_records(wb_path, record_cls):
+    """Stream records of one table from a workbook opened in read-only, values-only mode"""
+    wb = openpyxl.load_workbook(wb_path, read_only=True, data_only=True)
+    try:
+        yield from iter_workbook_records(wb, record_cls)
+    finally:
+        wb.close()
+
+def iter_csv_records(csv_path, record_cls):
+    """Stream records of one table from a sheet CSV"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        yield from iter_table_records(csv.reader(file), record_cls)
+
+def iter_records(path, record_cls):
+    """Stream records from either a workbook or a CSV, chosen by file extension"""
+    if path.lower().endswith('.csv'):
+        return iter_csv_records(path, record_cls)
+    return iter_sheet_records(path, record_cls)
+
+def import_table(path, record_cls):
+    """Load one table from a workbook or CSV into a compact ColumnarTable"""
+    return ColumnarTable(record_cls, iter_records(path, record_cls))
+
+def import_workbook(wb_path, sheets=None):
+    """Yield (sheet name, record iterator) for every known table of a workbook
+
+    One read-only parse of the file serves every sheet; it stays open until the pairs run out, so read
+    each sheet's records before moving on to the next (or materialize them, e.g. with list()).
+    """
+    wb = openpyxl.load_workbook(wb_path, read_only=True, data_only=True)
+    try:
+        for sheet_name in sheets or RECORD_TYPES:
+            yield sheet_name, iter_workbook_records(wb, RECORD_TYPES[sheet_name])
+    finally:
+        wb.close()
+
+def import_csv_directory(sheets_dir, sheets=None):
+    """Yield (sheet name, record iterator) for every known table with a sheet CSV in sheets_dir"""
+    for sheet_name in sheets or RECORD_TYPES:
+        csv_path = os.path.join(sheets_dir, f"{sheet_name}.csv")
+        if os.path.exists(csv_path):
+            yield sheet_name, iter_csv_records(csv_path, RECORD_TYPES[sheet_name])
+
+if __name__ == "__main__":
+    wb_path = sys.argv[1] if len(sys.argv) > 1 else "/home/grig/Projects/inventory_template/Beauty_Pro_Inventory_System_FINAL.xlsx"
+    print(f"Importing {wb_path}...")
+    for sheet_name, records in import_workbook(wb_path):
+        print(f"{sheet_name}: {sum(1 for _ in records)} rows")
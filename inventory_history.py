@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Inventory History
+Daily Inventory snapshots stored as compressed columnar deltas holding only the rows that changed,
+with a full checkpoint every CHECKPOINT_DAYS snapshots so any past day is rebuilt from a few files.
+"""
+
+import bisect
+import os
+import pickle
+import sys
+import time
+import zlib
+from datetime import date
+
+from diff_snapshots import row_digest
+from import_workbook import iter_records
+from inventory_model import InventoryItem, ColumnarTable
+
+DEFAULT_HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inventory_history")
+
+# Snapshots per full checkpoint, bounding the deltas replayed by a query
+CHECKPOINT_DAYS = 30
+# A day changing more than this share of the catalog is stored as a checkpoint instead of a delta
+CHECKPOINT_SHARE = 0.5
+COMPRESSION_LEVEL = 6
+# Decompressed snapshot blocks kept in memory between queries
+BLOCK_CACHE_SIZE = 64
+
+def write_block(path, table, removed):
+    """Write changed rows and removed product names as one compressed file, replacing it in one step"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(zlib.compress(pickle.dumps((table, removed), protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL))
+    os.replace(tmp_path, path)
+
+def read_block(path):
+    """(table, removed names, {name: row}) of one snapshot file"""
+    with open(path, 'rb') as file:
+        table, removed = pickle.loads(zlib.decompress(file.read()))
+    positions = {name: pos for pos, name in enumerate(table.column("name"))}
+    return table, removed, positions
+
+class InventoryHistory:
+    """Day-by-day Inventory snapshots: a manifest of recorded days plus one checkpoint or delta file per day"""
+
+    def __init__(self, path=DEFAULT_HISTORY_DIR):
+        self.path = path
+        # Recorded days as ordinals, and whether each is a "checkpoint" or a "delta"
+        self.days = []
+        self.kinds = []
+        # Row digest per product in the latest snapshot, to find the rows the next day changes
+        self.digests = {}
+        self.cache = {}
+        manifest_path = os.path.join(path, "manifest.pkl")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'rb') as file:
+                self.days, self.kinds, self.digests = pickle.load(file)
+
+    def block_path(self, ordinal, kind):
+        return os.path.join(self.path, f"{date.fromordinal(ordinal).isoformat()}.{kind}")
+
+    def block(self, ordinal, kind):
+        path = self.block_path(ordinal, kind)
+        block = self.cache.get(path)
+        if block is None:
+            if len(self.cache) >= BLOCK_CACHE_SIZE:
+                del self.cache[next(iter(self.cache))]
+            block = self.cache[path] = read_block(path)
+        return block
+
+    def save_manifest(self):
+        tmp_path = os.path.join(self.path, "manifest.pkl.tmp")
+        with open(tmp_path, 'wb') as file:
+            pickle.dump((self.days, self.kinds, self.digests), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, os.path.join(self.path, "manifest.pkl"))
+
+    def record(self, day, items):
+        """Store one day's Inventory rows, returning the snapshot kind and the number of rows written"""
+        ordinal = day.toordinal()
+        if self.days and ordinal <= self.days[-1]:
+            raise ValueError(f"Snapshot for {day} is not after the last recorded day {date.fromordinal(self.days[-1])}")
+        items = list(items)
+        digests = {item.key(): row_digest(item) for item in items}
+        changed = [item for item in items if self.digests.get(item.key()) != digests[item.key()]]
+        removed = [name for name in self.digests if name not in digests]
+
+        since_checkpoint = self.kinds[::-1].index("checkpoint") if self.kinds else None
+        if (since_checkpoint is None or since_checkpoint + 1 >= CHECKPOINT_DAYS
+                or len(changed) + len(removed) > CHECKPOINT_SHARE * len(items)):
+            kind, rows, removed = "checkpoint", items, []
+        else:
+            kind, rows = "delta", changed
+
+        os.makedirs(self.path, exist_ok=True)
+        write_block(self.block_path(ordinal, kind), ColumnarTable(InventoryItem, rows), removed)
+        self.days.append(ordinal)
+        self.kinds.append(kind)
+        self.digests = digests
+        self.save_manifest()
+        return kind, len(rows)
+
+    def chain(self, day):
+        """(ordinal, kind) of the last checkpoint on or before day and the deltas after it, oldest first"""
+        end = bisect.bisect_right(self.days, day.toordinal())
+        start = end - 1
+        while start > 0 and self.kinds[start] != "checkpoint":
+            start -= 1
+        return list(zip(self.days[start:end], self.kinds[start:end])) if end else []
+
+    def locate(self, day):
+        """{name: (table, row)} for every product in the snapshot in force on day"""
+        state = {}
+        for ordinal, kind in self.chain(day):
+            table, removed, positions = self.block(ordinal, kind)
+            for name in removed:
+                state.pop(name, None)
+            state.update((name, (table, pos)) for name, pos in positions.items())
+        return state
+
+    def item_as_of(self, day, name):
+        """One product's Inventory row as recorded on or before day, or None"""
+        # Walk back from day to the checkpoint, stopping at the latest snapshot that mentions the product
+        for ordinal, kind in reversed(self.chain(day)):
+            table, removed, positions = self.block(ordinal, kind)
+            if name in positions:
+                return table[positions[name]]
+            if name in removed:
+                return None
+        return None
+
+    def items_as_of(self, day):
+        """Every product's Inventory row as recorded on or before day, in catalog order"""
+        return [table[pos] for table, pos in self.locate(day).values()]
+
+    def stock_as_of(self, day, name=None):
+        """Stock level of one product, or {name: stock} for the whole catalog, as of day"""
+        if name is not None:
+            item = self.item_as_of(day, name)
+            return item.current_stock if item is not None else None
+        return {name: table.columns["current_stock"].get(pos) for name, (table, pos) in self.locate(day).items()}
+
+    def value_as_of(self, day):
+        """Stock valuation (stock x unit cost) of the whole catalog as of day"""
+        total = 0.0
+        for table, pos in self.locate(day).values():
+            stock = table.columns["current_stock"].get(pos)
+            cost = table.columns["cost"].get(pos)
+            if stock is not None and cost is not None:
+                total += stock * cost
+        return total
+
+    def nbytes(self):
+        """Bytes on disk used by the snapshot files"""
+        return sum(os.path.getsize(self.block_path(ordinal, kind)) for ordinal, kind in zip(self.days, self.kinds))
+
+if __name__ == "__main__":
+    # record [inventory_path] [YYYY-MM-DD] | stock YYYY-MM-DD [product] | value YYYY-MM-DD
+    command = sys.argv[1] if len(sys.argv) > 1 else "record"
+    history = InventoryHistory(os.environ.get("INVENTORY_HISTORY_DIR", DEFAULT_HISTORY_DIR))
+    start = time.perf_counter()
+    if command == "record":
+        inventory_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets", "Inventory.csv")
+        day = date.fromisoformat(sys.argv[3]) if len(sys.argv) > 3 else date.today()
+        kind, rows = history.record(day, iter_records(inventory_path, InventoryItem))
+        print(f"Recorded {day} as a {kind} of {rows:,} rows in {time.perf_counter() - start:.2f}s "
+              f"({len(history.days)} days, {history.nbytes() / 2 ** 10:,.0f} KiB on disk)")
+    elif command == "stock":
+        day = date.fromisoformat(sys.argv[2])
+        if len(sys.argv) > 3:
+            print(f"{sys.argv[3]}: {history.stock_as_of(day, sys.argv[3])}")
+        else:
+            for name, stock in history.stock_as_of(day).items():
+                print(f"{name}: {stock}")
+        print(f"({time.perf_counter() - start:.3f}s)")
+    elif command == "value":
+        day = date.fromisoformat(sys.argv[2])
+        print(f"Stock value as of {day}: ${history.value_as_of(day):,.2f} ({time.perf_counter() - start:.3f}s)")
+    else:
+        sys.exit(f"Unknown command {command!r}, expected record, stock or value")
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Inventory Metrics
+Computes turnover, days of supply and ABC class for every SKU and category in one vectorized pass,
+then writes them into the Products, Inventory, Analytics and Dashboard worksheets.
+"""
+
+import numpy as np
+from copy import copy
+from openpyxl.utils import get_column_letter
+
+from analytics_rollups import METRICS, load_workbook_rollups
+from import_workbook import locate_table
+from inventory_model import Product, InventoryItem
+from shard_sheets import table_worksheets, table_records
+
+# Cumulative revenue share closing the A and B classes
+ABC_THRESHOLDS = (0.80, 0.95)
+# Days of sales history needed before turnover is annualized; shorter windows would be extrapolated wildly
+MIN_TURNOVER_DAYS = 30
+SUMMARY_TITLE = "📦 INVENTORY TURNOVER & ABC ANALYSIS"
+
+def abc_classes(revenue, thresholds=ABC_THRESHOLDS):
+    """Pareto class per item: A for the items making up the first 80% of revenue, B to 95%, C for the rest"""
+    classes = np.full(len(revenue), "C", dtype="<U1")
+    total = revenue.sum()
+    if total <= 0:
+        return classes
+    order = np.argsort(-revenue, kind="stable")
+    share = revenue[order] / total
+    # Share accumulated before each item, so the item crossing a threshold stays in the higher class
+    before = np.cumsum(share) - share
+    ranked = np.where(before < thresholds[0], "A", np.where(before < thresholds[1], "B", "C"))
+    ranked[share <= 0] = "C"
+    classes[order] = ranked
+    return classes
+
+def turnover_and_supply(stock, stock_value, units, cogs, period_days):
+    """Annualized turnover (COGS / stock value) and days of supply at the current sales rate"""
+    turnover = np.zeros(len(stock))
+    days_of_supply = np.full(len(stock), np.inf)
+    if period_days > 0:
+        annual_cogs = cogs * (365.0 / period_days)
+        np.divide(annual_cogs, stock_value, out=turnover, where=stock_value > 0)
+        daily_units = units / period_days
+        np.divide(stock, daily_units, out=days_of_supply, where=daily_units > 0)
+    return turnover, days_of_supply
+
+class CatalogMetrics:
+    """Per-SKU and per-category metric arrays for the whole catalog"""
+
+    def __init__(self, names, skus, categories, stock, unit_cost, sales, period_days):
+        self.names = names
+        self.skus = skus
+        self.period_days = period_days
+        self.turnover_ready = period_days >= MIN_TURNOVER_DAYS
+
+        units = sales[:, METRICS.index("units")]
+        revenue = sales[:, METRICS.index("revenue")]
+        cogs = sales[:, METRICS.index("cost")]
+        stock_value = stock * unit_cost
+
+        self.turnover, self.days_of_supply = turnover_and_supply(stock, stock_value, units, cogs, period_days)
+        self.abc = abc_classes(revenue)
+
+        # Category totals reuse the same arrays through integer codes
+        self.categories, inverse = np.unique(np.asarray(categories, dtype=str), return_inverse=True)
+        sums = [np.bincount(inverse, weights=column, minlength=len(self.categories))
+                for column in (stock, stock_value, units, revenue, cogs)]
+        self.category_class_counts = {cls: np.bincount(inverse[self.abc == cls], minlength=len(self.categories))
+                                      for cls in "ABC"}
+        self.category_stock_value = sums[1]
+        self.category_revenue = sums[3]
+        self.category_turnover, self.category_days_of_supply = turnover_and_supply(sums[0], sums[1], sums[2], sums[4], period_days)
+        self.category_abc = abc_classes(sums[3])
+
+        self.total_turnover, _ = turnover_and_supply(np.array([stock.sum()]), np.array([stock_value.sum()]),
+                                                     np.array([units.sum()]), np.array([cogs.sum()]), period_days)
+        self.total_turnover = float(self.total_turnover[0])
+
+    def subset(self, names):
+        """Copy with the per-SKU values of only the given products, for writing one shard"""
+        picked = [pos for pos, name in enumerate(self.names) if name in names]
+        metrics = copy(self)
+        metrics.names = [self.names[pos] for pos in picked]
+        metrics.skus = [self.skus[pos] for pos in picked]
+        metrics.turnover, metrics.days_of_supply, metrics.abc = self.turnover[picked], self.days_of_supply[picked], self.abc[picked]
+        return metrics
+
+    def format_turnover(self, value):
+        """Turnover as "4.2x", or "--" until MIN_TURNOVER_DAYS of history are recorded"""
+        return f"{value:.1f}x" if self.turnover_ready else "--"
+
+    def row_values(self, pos):
+        """Formatted (turnover, days of supply, ABC class) for one SKU"""
+        return self.format_turnover(self.turnover[pos]), format_days(self.days_of_supply[pos]), self.abc[pos]
+
+def format_days(value):
+    return int(round(value)) if np.isfinite(value) else "--"
+
+def compute_metrics(products, inventory, rollups, months=12):
+    """Join products with their inventory rows and sales history and compute all metrics at once"""
+    stock_by_name = {item.name: item for item in inventory}
+    names, skus, categories, stock, unit_cost = [], [], [], [], []
+    for product in products:
+        item = stock_by_name.get(product.name)
+        names.append(product.name)
+        skus.append(product.sku)
+        categories.append(product.category or "Uncategorized")
+        stock.append((item.current_stock or 0) if item else 0)
+        if product.cost is not None:
+            unit_cost.append(product.cost)
+        else:
+            unit_cost.append((item.cost or 0) if item else 0)
+    sales, period_days = rollups.window_totals(skus, months)
+    return CatalogMetrics(names, skus, categories, np.array(stock, dtype=float), np.array(unit_cost, dtype=float), sales, period_days)
+
+def section_style_cell(ws):
+    """First section header on a sheet, used to style new sections the same way"""
+    for row in ws.iter_rows(min_row=3, max_row=6, max_col=1):
+        if row[0].value:
+            return row[0]
+    return None
+
+def write_metric_columns(ws, record_cls, metrics):
+    """Append Turnover, Days of Supply and ABC Class columns to a worksheet table"""
+    header_row, rows = locate_table(ws, record_cls)
+    if header_row is None:
+        return
+    positions = {name: pos for pos, name in enumerate(metrics.names)}
+
+    # Reuse the metric columns of an earlier run, otherwise start after the last header
+    header_values = [cell.value for cell in ws[header_row]]
+    if "Turnover" in header_values:
+        last_col = header_values.index("Turnover")
+    else:
+        last_col = max(col for col, value in enumerate(header_values, 1) if value)
+    header_cell = ws.cell(row=header_row, column=last_col)
+    for offset, header in enumerate(["Turnover", "Days of Supply", "ABC Class"], 1):
+        cell = ws.cell(row=header_row, column=last_col + offset, value=header)
+        cell._style = copy(header_cell._style)
+        ws.column_dimensions[get_column_letter(last_col + offset)].width = len(header) + 4
+    for row_number, record in rows:
+        pos = positions.get(record.name)
+        if pos is None:
+            continue
+        data_cell = ws.cell(row=row_number, column=1)
+        for offset, value in enumerate(metrics.row_values(pos), 1):
+            cell = ws.cell(row=row_number, column=last_col + offset, value=value)
+            cell._style = copy(data_cell._style)
+
+def find_summary(ws):
+    """Row of the turnover summary written by an earlier run, or None"""
+    for row in ws.iter_rows(max_col=1):
+        if row[0].value == SUMMARY_TITLE:
+            return row[0].row
+    return None
+
+def write_analytics_summary(ws, metrics):
+    """Summarise turnover and ABC classes per category below the existing Analytics content"""
+    start = find_summary(ws)
+    if start is None:
+        start = ws.max_row + 2
+    else:
+        # Rewrite the summary of an earlier run in place, clearing its old rows first
+        for row in ws.iter_rows(min_row=start + 1, max_row=ws.max_row, max_col=7):
+            for cell in row:
+                cell.value = None
+    ws.cell(row=start, column=1, value=SUMMARY_TITLE)
+    style_cell = section_style_cell(ws)
+    if style_cell is not None:
+        ws.cell(row=start, column=1)._style = copy(style_cell._style)
+
+    headers = ["Category", "Stock Value", "Revenue", "Turnover", "Days of Supply", "ABC Class", "A / B / C SKUs"]
+    for col_idx, header in enumerate(headers, 1):
+        ws.cell(row=start + 2, column=col_idx, value=header)
+
+    rows = []
+    for pos in np.argsort(-metrics.category_revenue, kind="stable"):
+        counts = " / ".join(str(int(metrics.category_class_counts[cls][pos])) for cls in "ABC")
+        rows.append([
+            str(metrics.categories[pos]),
+            f"${metrics.category_stock_value[pos]:,.2f}",
+            f"${metrics.category_revenue[pos]:,.0f}",
+            metrics.format_turnover(metrics.category_turnover[pos]),
+            format_days(metrics.category_days_of_supply[pos]),
+            str(metrics.category_abc[pos]),
+            counts,
+        ])
+    rows.append(["All Products", f"${metrics.category_stock_value.sum():,.2f}", f"${metrics.category_revenue.sum():,.0f}",
+                 metrics.format_turnover(metrics.total_turnover), "", "", ""])
+    if not metrics.turnover_ready:
+        rows.append([f"Turnover is shown once {MIN_TURNOVER_DAYS} days of sales are recorded "
+                     f"({metrics.period_days} so far)"])
+    for row_idx, row_data in enumerate(rows, start + 3):
+        for col_idx, value in enumerate(row_data, 1):
+            ws.cell(row=row_idx, column=col_idx, value=value)
+
+def update_dashboard_turnover(ws, metrics):
+    """Replace the sample Inventory Turnover figure on the Dashboard"""
+    for row in ws.iter_rows(max_row=20, max_col=1):
+        if row[0].value == "Inventory Turnover":
+            ws.cell(row=row[0].row, column=2, value=metrics.format_turnover(metrics.total_turnover))
+            return
+
+def update_efficiency_turnover(ws, metrics):
+    """Fill the Analytics INVENTORY EFFICIENCY turnover row, measured against the target in its Target column"""
+    for row in ws.iter_rows(max_col=6):
+        if row[0].value != "Inventory Turnover":
+            continue
+        try:
+            target = float(str(row[2].value).rstrip("x"))
+        except ValueError:
+            target = None
+        row[1].value = metrics.format_turnover(metrics.total_turnover)
+        if not metrics.turnover_ready or target is None:
+            row[3].value = row[4].value = "--"
+        elif metrics.total_turnover >= target:
+            row[3].value, row[4].value, row[5].value = "🟢 On Target", "Maintain", "Continue current strategy"
+        else:
+            row[3].value, row[4].value = "🟡 Below Target", f"+{target - metrics.total_turnover:.1f}x"
+            row[5].value = "Reduce slow movers"
+        return
+
+def add_inventory_metrics(wb, rollups=None):
+    """Compute catalog metrics from the built sheets (or their shard sheets) and write them back into the workbook"""
+    if rollups is None:
+        rollups = load_workbook_rollups(wb)
+    metrics = compute_metrics(table_records(wb, Product), table_records(wb, InventoryItem), rollups)
+
+    for record_cls in (Product, InventoryItem):
+        for ws in table_worksheets(wb, record_cls.SHEET):
+            write_metric_columns(ws, record_cls, metrics)
+    write_analytics_summary(wb["Analytics"], metrics)
+    update_efficiency_turnover(wb["Analytics"], metrics)
+    update_dashboard_turnover(wb["Dashboard"], metrics)
+    return metrics
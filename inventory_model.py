@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - In-Memory Data Model
+Typed record classes for the catalog tables and the converters used to build them from sheet rows.
+"""
+
+from array import array
+from datetime import date, datetime
+import sys
+
+def parse_text(value):
+    """Return a stripped string, or None for empty cells"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+def parse_number(value):
+    """Parse numbers written as 12, 12.0, "$12.00", "$1,250" or "50%" """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace('$', '').replace(',', '').replace('%', '')
+    if not text or text.startswith('='):
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def parse_int(value):
+    """Parse whole-number cells such as stock levels and lead times"""
+    number = parse_number(value)
+    if number is None:
+        return None
+    return int(round(number))
+
+def parse_date(value):
+    """Parse ISO dates, keeping date objects written by Excel as-is"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip()[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+class Record:
+    """Base class for one data row of a sheet table"""
+
+    __slots__ = ()
+
+    # Worksheet (and CSV file stem) holding the table
+    SHEET = None
+    # (header text, attribute name, converter) for every column
+    COLUMNS = ()
+    # Headers that must all be present for a row to count as the table header
+    REQUIRED = ()
+    # Text columns with few distinct values, dictionary-encoded in columnar tables
+    CATEGORICAL = ()
+
+    def __init__(self, **values):
+        for _, attr, _ in self.COLUMNS:
+            setattr(self, attr, values.get(attr))
+
+    @classmethod
+    def fields(cls):
+        """Attribute names in column order"""
+        return [attr for _, attr, _ in cls.COLUMNS]
+
+    @classmethod
+    def headers(cls):
+        """Sheet header texts in column order"""
+        return [header for header, _, _ in cls.COLUMNS]
+
+    @classmethod
+    def from_row(cls, row, positions):
+        """Build a record from a raw row using the column positions of the header row"""
+        values = {}
+        for (_, attr, convert), pos in zip(cls.COLUMNS, positions):
+            raw = row[pos] if pos is not None and pos < len(row) else None
+            values[attr] = convert(raw)
+        return cls(**values)
+
+    def key(self):
+        """Identity used to match rows between snapshots: SKU where the table has one, otherwise name"""
+        return getattr(self, "sku", None) or self.name
+
+    def to_row(self):
+        """Values in column order, ready to write back to a sheet"""
+        return [getattr(self, attr) for attr in self.fields()]
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_row() == other.to_row()
+
+    def __repr__(self):
+        pairs = ", ".join(f"{attr}={getattr(self, attr)!r}" for attr in self.fields())
+        return f"{type(self).__name__}({pairs})"
+
+class Category(Record):
+    SHEET = "Categories"
+    COLUMNS = (
+        ("Category Name", "name", parse_text),
+        ("Description", "description", parse_text),
+        ("Target Margin %", "target_margin", parse_number),
+        ("Reorder Days", "reorder_days", parse_int),
+        ("Status", "status", parse_text),
+        ("Products Count", "products_count", parse_int),
+        ("Last Updated", "last_updated", parse_date),
+        ("Notes", "notes", parse_text),
+    )
+    REQUIRED = ("Category Name", "Target Margin %")
+    CATEGORICAL = ("status",)
+    __slots__ = tuple(attr for _, attr, _ in COLUMNS)
+
+class Supplier(Record):
+    SHEET = "Suppliers"
+    COLUMNS = (
+        ("Supplier Name", "name", parse_text),
+        ("Contact Person", "contact", parse_text),
+        ("Email", "email", parse_text),
+        ("Phone", "phone", parse_text),
+        ("Lead Time (Days)", "lead_time_days", parse_int),
+        ("Payment Terms", "payment_terms", parse_text),
+        ("Categories", "categories", parse_text),
+        ("Rating", "rating", parse_text),
+        ("Last Order", "last_order", parse_date),
+        ("Notes", "notes", parse_text),
+    )
+    REQUIRED = ("Supplier Name", "Lead Time (Days)")
+    CATEGORICAL = ("payment_terms", "categories", "rating")
+    __slots__ = tuple(attr for _, attr, _ in COLUMNS)
+
+class Product(Record):
+    SHEET = "Products"
+    COLUMNS = (
+        ("Product Name", "name", parse_text),
+        ("Brand", "brand", parse_text),
+        ("Category", "category", parse_text),
+        ("SKU", "sku", parse_text),
+        ("Supplier", "supplier", parse_text),
+        ("Cost", "cost", parse_number),
+        ("Retail Price", "retail_price", parse_number),
+        ("Margin %", "margin", parse_number),
+        ("Barcode", "barcode", parse_text),
+        ("Expiry Date", "expiry_date", parse_date),
+        ("Min Stock", "min_stock", parse_int),
+        ("Max Stock", "max_stock", parse_int),
+        ("Location", "location", parse_text),
+        ("Notes", "notes", parse_text),
+    )
+    REQUIRED = ("Product Name", "SKU", "Retail Price")
+    CATEGORICAL = ("brand", "category", "supplier", "location")
+    __slots__ = tuple(attr for _, attr, _ in COLUMNS)
+
+class InventoryItem(Record):
+    SHEET = "Inventory"
+    COLUMNS = (
+        ("Product Name", "name", parse_text),
+        ("Current Stock", "current_stock", parse_int),
+        ("Min Stock", "min_stock", parse_int),
+        ("Max Stock", "max_stock", parse_int),
+        ("Reorder Level", "reorder_level", parse_int),
+        ("Status", "status", parse_text),
+        ("Days to Expiry", "days_to_expiry", parse_int),
+        ("Last Updated", "last_updated", parse_date),
+        ("Location", "location", parse_text),
+        ("Cost", "cost", parse_number),
+        ("Retail", "retail", parse_number),
+        ("Total Value", "total_value", parse_number),
+        ("Reorder Qty", "reorder_qty", parse_int),
+        ("Supplier", "supplier", parse_text),
+        ("Action", "action", parse_text),
+    )
+    REQUIRED = ("Product Name", "Current Stock", "Min Stock")
+    CATEGORICAL = ("status", "location", "supplier", "action")
+    __slots__ = tuple(attr for _, attr, _ in COLUMNS)
+
+class ReorderItem(Record):
+    SHEET = "Reorder"
+    COLUMNS = (
+        ("Product Name", "name", parse_text),
+        ("Current Stock", "current_stock", parse_int),
+        ("Min Level", "min_level", parse_int),
+        ("Reorder To", "reorder_to", parse_int),
+        ("Order Qty", "order_qty", parse_int),
+        ("Supplier", "supplier", parse_text),
+        ("Cost per Unit", "unit_cost", parse_number),
+        ("Total Cost", "total_cost", parse_number),
+        ("Priority", "priority", parse_text),
+        ("Action", "action", parse_text),
+    )
+    REQUIRED = ("Product Name", "Order Qty", "Priority")
+    CATEGORICAL = ("supplier", "priority", "action")
+    __slots__ = tuple(attr for _, attr, _ in COLUMNS)
+
+class Transaction(Record):
+    SHEET = "QuickAdd"
+    COLUMNS = (
+        ("Date", "date", parse_date),
+        ("Product", "product", parse_text),
+        ("Change", "change", parse_int),
+        ("Type", "type", parse_text),
+        ("New Stock", "new_stock", parse_int),
+        ("User", "user", parse_text),
+        ("Notes", "notes", parse_text),
+    )
+    REQUIRED = ("Date", "Product", "Change", "Type")
+    CATEGORICAL = ("product", "type", "user")
+    __slots__ = tuple(attr for _, attr, _ in COLUMNS)
+
+    def key(self):
+        return f"{self.date}|{self.product}|{self.change}|{self.type}"
+
+# Record types keyed by the sheet that holds them
+RECORD_TYPES = {cls.SHEET: cls for cls in (Category, Supplier, Product, InventoryItem, ReorderItem, Transaction)}
+
+# Missing-value markers for the typed columns
+INT_NULL = -(2 ** 31)
+DATE_NULL = 0
+
+class NumberColumn:
+    """Floats in an array('d'), NaN marking empty cells"""
+
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values = array('d')
+
+    def append(self, value):
+        self.values.append(float('nan') if value is None else value)
+
+    def get(self, pos):
+        value = self.values[pos]
+        return None if value != value else value
+
+    def append_column(self, other):
+        self.values.extend(other.values)
+
+    def nbytes(self):
+        return self.values.itemsize * len(self.values)
+
+class IntColumn:
+    """Whole numbers in an array('i'), INT_NULL marking empty cells"""
+
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values = array('i')
+
+    def append(self, value):
+        self.values.append(INT_NULL if value is None else value)
+
+    def get(self, pos):
+        value = self.values[pos]
+        return None if value == INT_NULL else value
+
+    def append_column(self, other):
+        self.values.extend(other.values)
+
+    def nbytes(self):
+        return self.values.itemsize * len(self.values)
+
+class DateColumn:
+    """Dates as proleptic ordinals in an array('i'), DATE_NULL marking empty cells"""
+
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values = array('i')
+
+    def append(self, value):
+        self.values.append(DATE_NULL if value is None else value.toordinal())
+
+    def get(self, pos):
+        value = self.values[pos]
+        return None if value == DATE_NULL else date.fromordinal(value)
+
+    def append_column(self, other):
+        self.values.extend(other.values)
+
+    def nbytes(self):
+        return self.values.itemsize * len(self.values)
+
+class StringColumn:
+    """Mostly-unique text packed as UTF-8 into one buffer with an offsets array"""
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('q', [0])
+
+    def append(self, value):
+        if value is not None:
+            self.data += value.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+    def get(self, pos):
+        start, end = self.offsets[pos], self.offsets[pos + 1]
+        return self.data[start:end].decode('utf-8') if end > start else None
+
+    def append_column(self, other):
+        base = len(self.data)
+        self.data += other.data
+        self.offsets.extend(array('q', [offset + base for offset in other.offsets[1:]]))
+
+    def nbytes(self):
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+class CategoricalColumn:
+    """Repeated text stored once in a dictionary, rows holding small integer codes (0 for empty)"""
+
+    __slots__ = ("codes", "categories", "index")
+
+    def __init__(self):
+        self.codes = array('B')
+        self.categories = [None]
+        self.index = {None: 0}
+
+    def encode(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.categories)
+            self.index[value] = code
+            self.categories.append(value)
+            # Widen the code array once the dictionary outgrows it
+            if code > 2 ** (8 * self.codes.itemsize) - 1:
+                self.codes = array('H' if code <= 0xFFFF else 'I', self.codes)
+        return code
+
+    def append(self, value):
+        # Encode first: widening replaces self.codes
+        code = self.encode(value)
+        self.codes.append(code)
+
+    def get(self, pos):
+        return self.categories[self.codes[pos]]
+
+    def append_column(self, other):
+        """Append another column's rows, re-coding them against this column's dictionary"""
+        remap = [self.encode(value) for value in other.categories]
+        if remap == list(range(len(remap))) and other.codes.typecode == self.codes.typecode:
+            self.codes.extend(other.codes)
+        elif self.codes.typecode == 'B':
+            # Byte codes are re-coded by a translation table without a Python-level loop
+            table = bytes(remap) + bytes(256 - len(remap))
+            self.codes.frombytes(other.codes.tobytes().translate(table))
+        else:
+            self.codes.extend(array(self.codes.typecode, [remap[code] for code in other.codes]))
+
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes) + sum(sys.getsizeof(value) for value in self.categories[1:])
+
+# Column storage for each converter
+COLUMN_TYPES = {
+    parse_number: NumberColumn,
+    parse_int: IntColumn,
+    parse_date: DateColumn,
+    parse_text: StringColumn,
+}
+
+class ColumnarTable:
+    """Array-backed table of one record type, materializing records only on access"""
+
+    def __init__(self, record_cls, records=()):
+        self.record_cls = record_cls
+        self.columns = {}
+        for _, attr, convert in record_cls.COLUMNS:
+            column_type = CategoricalColumn if attr in record_cls.CATEGORICAL else COLUMN_TYPES[convert]
+            self.columns[attr] = column_type()
+        self.length = 0
+        self.extend(records)
+
+    def append(self, record):
+        for attr, column in self.columns.items():
+            column.append(getattr(record, attr))
+        self.length += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def append_table(self, other):
+        """Append the rows of another table of the same record type, column by column"""
+        for attr, column in self.columns.items():
+            column.append_column(other.columns[attr])
+        self.length += other.length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, pos):
+        if pos < 0:
+            pos += self.length
+        if not 0 <= pos < self.length:
+            raise IndexError("row index out of range")
+        return self.record_cls(**{attr: column.get(pos) for attr, column in self.columns.items()})
+
+    def __iter__(self):
+        for pos in range(self.length):
+            yield self[pos]
+
+    def column(self, attr):
+        """Decoded values of one column as a list"""
+        column = self.columns[attr]
+        return [column.get(pos) for pos in range(self.length)]
+
+    def nbytes(self):
+        """Bytes held by the column buffers and dictionaries"""
+        return sum(column.nbytes() for column in self.columns.values())
+
+    def bytes_per_row(self):
+        return self.nbytes() / self.length if self.length else 0.0
+
+def measure_bytes_per_row(rows=1000000):
+    """Measure memory per Inventory row as parsed CSV string lists versus a ColumnarTable"""
+    import csv
+    import tracemalloc
+
+    statuses = ["🟢 Healthy", "🟡 Low Stock", "🟡 At Minimum", "🔴 Out of Stock"]
+    suppliers = ["Beauty Supply Co", "Glamour Wholesale", "Premium Cosmetics", "Luxury Beauty Inc"]
+    actions = ["Continue", "ORDER NOW", "Monitor", "URGENT ORDER"]
+
+    def csv_lines():
+        for i in range(rows):
+            yield (f"Product {i:07d},{i % 40},5,25,8,{statuses[i % 4]},{i % 730},2024-01-15,"
+                   f"Shelf {chr(65 + i % 6)}{i % 9 + 1},$12.00,$24.00,${(i % 40) * 12:.2f},{25 - i % 25},"
+                   f"{suppliers[i % 4]},{actions[i % 4]}")
+
+    def traced_bytes(build):
+        """Bytes still allocated once build() returns, with its result kept alive"""
+        tracemalloc.start()
+        result = build()
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return allocated
+
+    # Rows as read_csv_data holds them: one list of fresh strings per row
+    list_bytes = traced_bytes(lambda: list(csv.reader(csv_lines())))
+    positions = list(range(len(InventoryItem.COLUMNS)))
+    table_bytes = traced_bytes(lambda: ColumnarTable(
+        InventoryItem, (InventoryItem.from_row(row, positions) for row in csv.reader(csv_lines()))))
+    return list_bytes / rows, table_bytes / rows
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    list_per_row, table_per_row = measure_bytes_per_row(rows)
+    print(f"Inventory rows: {rows:,}")
+    print(f"List of CSV strings: {list_per_row:,.0f} bytes/row ({list_per_row * rows / 2 ** 20:,.0f} MiB)")
+    print(f"ColumnarTable:       {table_per_row:,.0f} bytes/row ({table_per_row * rows / 2 ** 20:,.0f} MiB)")
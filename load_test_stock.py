@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Stock Update Load Test
+Simulates concurrent tills issuing receive/sell/adjust updates against the stock store
+while report readers scan it, then reports throughput, latency percentiles and lost updates.
+
+The store is in memory only, so its figures bound what the model alone can do: an upper bound on
+throughput and a lower bound on latency. Given a sheets directory, the run's transactions are then
+written to a copy of its QuickAdd.csv and folded in by the sheet watcher, which is how till updates
+reach the workbook and sales rollups, and that refresh is timed and checked as well.
+"""
+
+import csv
+import numpy as np
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from export_tables import plain_value
+from import_workbook import iter_records, iter_table_rows, iter_table_records
+from inventory_model import InventoryItem, Product, Transaction
+from stock_store import StockStore
+from watch_sheets import SheetWatcher
+
+# Share of till operations by transaction type, with the quantity range of each
+WORKLOAD = (
+    ("Sale", 0.70, (-3, -1)),
+    ("Stock Received", 0.20, (6, 24)),
+    ("Adjustment", 0.10, (-2, 2)),
+)
+
+class TillResult:
+    """What one till saw: per-update latencies and the changes the store acknowledged"""
+
+    def __init__(self):
+        self.latencies = []
+        self.acknowledged = Counter()
+        self.applied = 0
+        self.rejected = 0
+
+def till_worker(store, till, updates, seed, start, result):
+    """Issue updates as fast as possible, skewed towards a few best-selling products"""
+    rng = random.Random(seed * 1000 + till)
+    names = store.names
+    # Popularity falls off with rank, so a handful of products take most of the traffic
+    weights = [1.0 / (rank + 1) for rank in range(len(names))]
+    products = rng.choices(names, weights, k=updates)
+    kinds = rng.choices(WORKLOAD, [share for _, share, _ in WORKLOAD], k=updates)
+    start.wait()
+    for product, (kind, _, (low, high)) in zip(products, kinds):
+        change = rng.randint(low, high)
+        if change == 0:
+            change = 1
+        began = time.perf_counter_ns()
+        try:
+            store.apply(product, change, kind, user=f"Till {till}")
+        except ValueError:
+            result.rejected += 1
+        else:
+            result.acknowledged[product] += change
+            result.applied += 1
+        result.latencies.append(time.perf_counter_ns() - began)
+
+def reader_worker(store, start, stop, latencies):
+    """Report workload: low-stock list and stock valuation over a consistent snapshot"""
+    start.wait()
+    while not stop.is_set():
+        began = time.perf_counter_ns()
+        store.low_stock()
+        store.stock_value()
+        latencies.append(time.perf_counter_ns() - began)
+
+def percentiles(latencies_ns):
+    """p50/p95/p99 latency in microseconds"""
+    if not latencies_ns:
+        return dict.fromkeys(("p50", "p95", "p99"), 0.0)
+    values = np.percentile(np.asarray(latencies_ns, dtype=np.int64), [50, 95, 99]) / 1000.0
+    return dict(zip(("p50", "p95", "p99"), values))
+
+def check_lost_updates(store, initial, results):
+    """Compare final stock with the acknowledged changes and replay the transaction log, returning problems found"""
+    problems = []
+    acknowledged = Counter()
+    for result in results:
+        acknowledged.update(result.acknowledged)
+    applied = sum(result.applied for result in results)
+
+    for name, pos in store.positions.items():
+        expected = initial[pos] + acknowledged[name]
+        if store.stock[pos] != expected:
+            problems.append(f"{name}: stock {store.stock[pos]}, expected {expected}")
+    if len(store.transactions) != applied:
+        problems.append(f"{len(store.transactions)} transactions logged for {applied} acknowledged updates")
+
+    # Every logged update must start from the stock the previous one left
+    levels = {name: initial[pos] for name, pos in store.positions.items()}
+    for transaction in store.transactions:
+        if levels[transaction.product] + transaction.change != transaction.new_stock:
+            problems.append(f"{transaction.product}: {levels[transaction.product]} {transaction.change:+d} logged as {transaction.new_stock}")
+        levels[transaction.product] = transaction.new_stock
+    return problems
+
+def run_load_test(items, tills=8, updates=10000, readers=2, seed=0, sheets_dir=None):
+    """Run the tills and readers concurrently, returning a summary dict
+
+    With sheets_dir, the applied transactions are also pushed through the sheet watcher (see run_watcher_pass).
+    """
+    store = StockStore(items)
+    initial = list(store.stock)
+    results = [TillResult() for _ in range(tills)]
+    reader_latencies = [[] for _ in range(readers)]
+    start = threading.Barrier(tills + readers + 1)
+    stop = threading.Event()
+
+    threads = [threading.Thread(target=till_worker, args=(store, till, updates, seed, start, results[till]))
+               for till in range(tills)]
+    threads += [threading.Thread(target=reader_worker, args=(store, start, stop, reader_latencies[reader]))
+                for reader in range(readers)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in threads[:tills]:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    stop.set()
+    for thread in threads[tills:]:
+        thread.join()
+
+    applied = sum(result.applied for result in results)
+    return {
+        "tills": tills,
+        "readers": readers,
+        "applied": applied,
+        "rejected": sum(result.rejected for result in results),
+        "seconds": elapsed,
+        "throughput": applied / elapsed if elapsed else 0.0,
+        "update_latency": percentiles([value for result in results for value in result.latencies]),
+        "reads": sum(len(latencies) for latencies in reader_latencies),
+        "read_latency": percentiles([value for latencies in reader_latencies for value in latencies]),
+        "lost_updates": check_lost_updates(store, initial, results),
+        "watcher": run_watcher_pass(store, sheets_dir) if sheets_dir else None,
+    }
+
+def insert_transactions(csv_path, transactions):
+    """Write transactions into a QuickAdd CSV directly after the last row of its table"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        rows = list(csv.reader(file))
+    numbered = list(iter_table_rows(rows, Transaction))
+    if not numbered:
+        raise ValueError(f"No QuickAdd table in {csv_path}")
+    last, positions = numbered[-1][0], numbered[0][2]
+    width = max(len(rows[last - 1]), max(pos for pos in positions if pos is not None) + 1)
+    new_rows = []
+    for transaction in transactions:
+        row = [""] * width
+        for pos, value in zip(positions, transaction.to_row()):
+            if pos is not None and value is not None:
+                row[pos] = plain_value(value)
+        new_rows.append(row)
+    with open(csv_path, 'w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows(rows[:last] + new_rows + rows[last:])
+
+def sold_units(rollups):
+    return sum(rollups.totals("daily", day)["units"] for day in rollups.periods("daily"))
+
+def run_watcher_pass(store, sheets_dir):
+    """Push the run's transactions through the sheet watcher on a copy of sheets_dir, returning a summary dict"""
+    work_dir = tempfile.mkdtemp(prefix="load_test_stock_")
+    try:
+        copy_dir = os.path.join(work_dir, "sheets")
+        shutil.copytree(sheets_dir, copy_dir)
+        watcher = SheetWatcher(copy_dir, os.path.join(work_dir, "Beauty_Pro_Inventory_System.xlsx"),
+                               store_path=os.path.join(work_dir, "analytics_rollups.pkl"))
+        watcher.start()
+        rows_before = sum(1 for _ in iter_table_records(watcher.rows["QuickAdd"], Transaction))
+        units_before = sold_units(watcher.rollups)
+        products = {product.name for product in iter_table_records(watcher.rows["Products"], Product)}
+
+        insert_transactions(os.path.join(copy_dir, "QuickAdd.csv"), store.transactions)
+        began = time.perf_counter()
+        watcher.refresh({"QuickAdd"})
+        elapsed = time.perf_counter() - began
+
+        problems = []
+        rows_after = sum(1 for _ in iter_table_records(watcher.rows["QuickAdd"], Transaction))
+        if rows_after != rows_before + len(store.transactions):
+            problems.append(f"QuickAdd holds {rows_after - rows_before:,} new rows for {len(store.transactions):,} updates")
+        # Only sales of products listed in Products reach the rollups
+        expected = sum(-t.change for t in store.transactions if t.type == "Sale" and t.product in products)
+        units = sold_units(watcher.rollups) - units_before
+        if units != expected:
+            problems.append(f"rollups gained {units:,.0f} units sold, expected {expected:,}")
+        return {"updates": len(store.transactions), "seconds": elapsed,
+                "throughput": len(store.transactions) / elapsed if elapsed else 0.0, "lost_updates": problems}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def format_latency(latency):
+    return "  ".join(f"{label} {value:,.1f}us" for label, value in latency.items())
+
+if __name__ == "__main__":
+    tills = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    inventory_path = sys.argv[4] if len(sys.argv) > 4 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets", "Inventory.csv")
+    # A sheets directory adds the pass through QuickAdd.csv and the sheet watcher
+    sheets_dir = sys.argv[5] if len(sys.argv) > 5 else None
+
+    items = list(iter_records(inventory_path, InventoryItem))
+    print(f"Load test: {tills} tills x {updates:,} updates, {readers} readers, {len(items)} products")
+    summary = run_load_test(items, tills, updates, readers, sheets_dir=sheets_dir)
+    print("In-memory stock store only (upper bound on throughput, lower bound on latency):")
+    print(f"Applied {summary['applied']:,} updates ({summary['rejected']:,} rejected for insufficient stock) "
+          f"in {summary['seconds']:.2f}s: {summary['throughput']:,.0f} updates/s")
+    print(f"Update latency  {format_latency(summary['update_latency'])}")
+    print(f"Report latency  {format_latency(summary['read_latency'])} over {summary['reads']:,} reads")
+    problems = summary["lost_updates"]
+    watcher = summary["watcher"]
+    if watcher is not None:
+        print(f"Through QuickAdd.csv and the sheet watcher: {watcher['updates']:,} updates folded into the workbook "
+              f"and rollups in {watcher['seconds']:.2f}s: {watcher['throughput']:,.0f} updates/s")
+        problems = problems + watcher["lost_updates"]
+    if problems:
+        print(f"LOST UPDATES: {len(problems)} problems")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        sys.exit(1)
+    print("Lost updates: none")
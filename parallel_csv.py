@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Parallel CSV Parser
+Memory-maps a large sheet CSV, splits its table into chunks on record boundaries (never inside
+a quoted field) and parses the chunks in a process pool into ColumnarTable blocks merged in order.
+"""
+
+import csv
+import io
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from import_workbook import locate_header, import_table
+from inventory_model import RECORD_TYPES, ColumnarTable
+
+# Bytes per chunk handed to a worker; files smaller than one chunk are parsed in-process
+CHUNK_BYTES = 32 * 2 ** 20
+
+def iter_lines(mm, start=0):
+    """Yield (decoded line, offset after it) from a memory-mapped file"""
+    offset = start
+    size = len(mm)
+    while offset < size:
+        end = mm.find(b'\n', offset)
+        end = size if end == -1 else end + 1
+        yield mm[offset:end].decode('utf-8'), end
+        offset = end
+
+def locate_csv_table(mm, record_cls):
+    """Return (column positions, byte offset of the first row after the header), or (None, None)"""
+    lines = iter_lines(mm)
+    offsets = []
+
+    def text_lines():
+        for line, end in lines:
+            offsets.append(end)
+            yield line
+
+    # A quoted field may span lines, so the offset is where the reader stopped, not a line count
+    for row in csv.reader(text_lines()):
+        positions = locate_header(row, record_cls)
+        if positions is not None:
+            return positions, offsets[-1]
+    return None, None
+
+def split_records(mm, start, chunk_bytes=CHUNK_BYTES):
+    """Chunk (start, end) byte ranges from start to the end of the file, each ending on a record boundary"""
+    size = len(mm)
+    ranges = []
+    while start < size:
+        pos = min(start + chunk_bytes, size)
+        # An odd number of quote characters since the chunk start means pos is inside a quoted field;
+        # escaped quotes ("") come in pairs and leave the parity unchanged
+        quotes = mm[start:pos].count(b'"')
+        end = size
+        while pos < size:
+            newline = mm.find(b'\n', pos)
+            if newline == -1:
+                break
+            quotes += mm[pos:newline].count(b'"')
+            pos = newline + 1
+            if quotes % 2 == 0:
+                end = pos
+                break
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def parse_chunk(csv_path, start, end, record_cls, positions, first):
+    """Parse one byte range into a ColumnarTable, returning (block, whether the table ended in it)"""
+    with open(csv_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8')
+    block = ColumnarTable(record_cls)
+    key_pos = positions[0]
+    started = not first
+    for row in csv.reader(io.StringIO(text, newline='')):
+        key = row[key_pos] if key_pos < len(row) else None
+        if key is None or not key.strip():
+            # Same rule as iter_table_rows: spacer rows before the data are skipped,
+            # the first blank row after data ends the table
+            if started:
+                return block, True
+            continue
+        started = True
+        block.append(record_cls.from_row(row, positions))
+    return block, False
+
+def parse_csv_table(csv_path, record_cls, workers=None, chunk_bytes=CHUNK_BYTES, pool=None):
+    """Load the record_cls table of a sheet CSV into a ColumnarTable, parsing chunks in parallel"""
+    with open(csv_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ColumnarTable(record_cls)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            positions, data_start = locate_csv_table(mm, record_cls)
+            if positions is None:
+                return ColumnarTable(record_cls)
+            ranges = split_records(mm, data_start, chunk_bytes)
+
+    args = [(csv_path, start, end, record_cls, positions, index == 0) for index, (start, end) in enumerate(ranges)]
+    if len(ranges) == 1 or workers == 1:
+        blocks = (parse_chunk(*arg) for arg in args)
+    else:
+        executor = pool or ProcessPoolExecutor(workers)
+        blocks = executor.map(parse_chunk, *zip(*args))
+
+    table = ColumnarTable(record_cls)
+    try:
+        for block, ended in blocks:
+            table.append_table(block)
+            if ended:
+                break
+    finally:
+        if len(ranges) > 1 and workers != 1 and pool is None:
+            executor.shutdown(cancel_futures=True)
+    return table
+
+if __name__ == "__main__":
+    # Compare the single-core streaming importer with the chunked parser on one sheet CSV
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets", "Inventory.csv")
+    sheet_name = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(os.path.basename(csv_path))[0]
+    record_cls = RECORD_TYPES[sheet_name]
+    size_mb = os.path.getsize(csv_path) / 2 ** 20
+
+    start = time.perf_counter()
+    baseline = import_table(csv_path, record_cls)
+    elapsed = time.perf_counter() - start
+    print(f"{sheet_name}: {len(baseline):,} rows, {size_mb:,.0f} MiB")
+    print(f"csv.reader, 1 core:  {elapsed:.2f}s ({size_mb / elapsed:,.1f} MiB/s)")
+
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        table = parse_csv_table(csv_path, record_cls, workers)
+        elapsed = time.perf_counter() - start
+        same = len(table) == len(baseline) and all(a == b for a, b in zip(table, baseline))
+        print(f"chunked, {workers} workers: {elapsed:.2f}s ({size_mb / elapsed:,.1f} MiB/s)"
+              f"{'' if same else '  MISMATCH'}")
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Product Lookup Index
+Exact barcode/SKU lookup, name prefix search and trigram fuzzy search for QuickAdd scans.
+The index is saved as a snapshot plus an append-only journal, so adding products never rewrites it.
+"""
+
+import bisect
+import json
+import os
+import pickle
+import sys
+import time
+from array import array
+from datetime import date
+
+import numpy as np
+
+from import_workbook import iter_records
+from inventory_model import Product, ColumnarTable
+
+# Typos per name a fuzzy query is guaranteed to see through
+FUZZY_MAX_EDITS = 2
+# Names per block of the sorted name list; an insert shifts one block instead of the whole list
+NAME_BLOCK_SIZE = 1000
+
+def normalize(text):
+    """Lowercase and collapse whitespace for name matching"""
+    return " ".join(str(text).lower().split())
+
+def trigrams(text):
+    """Set of character trigrams of a normalized name, padded so short words still match"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SortedNames:
+    """Normalized names in sorted order with their row ids, stored as blocks of at most NAME_BLOCK_SIZE"""
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.blocks = [[name for name, _ in pairs[start:start + NAME_BLOCK_SIZE]]
+                       for start in range(0, len(pairs), NAME_BLOCK_SIZE)]
+        self.rows = [array('i', (row for _, row in pairs[start:start + NAME_BLOCK_SIZE]))
+                     for start in range(0, len(pairs), NAME_BLOCK_SIZE)]
+        # Last name of each block, to find the block a name belongs in
+        self.maxes = [block[-1] for block in self.blocks]
+
+    @classmethod
+    def from_blocks(cls, blocks, rows):
+        """Rebuild from the blocks of a snapshot, which stores them as plain lists"""
+        names = cls()
+        names.blocks, names.rows, names.maxes = blocks, rows, [block[-1] for block in blocks]
+        return names
+
+    def __len__(self):
+        return sum(len(block) for block in self.blocks)
+
+    def __iter__(self):
+        for block, rows in zip(self.blocks, self.rows):
+            yield from zip(block, rows)
+
+    def insert(self, name, row):
+        if not self.blocks:
+            self.blocks, self.rows, self.maxes = [[name]], [array('i', [row])], [name]
+            return
+        index = min(bisect.bisect_right(self.maxes, name), len(self.blocks) - 1)
+        block, rows = self.blocks[index], self.rows[index]
+        pos = bisect.bisect_right(block, name)
+        block.insert(pos, name)
+        rows.insert(pos, row)
+        self.maxes[index] = block[-1]
+        if len(block) > 2 * NAME_BLOCK_SIZE:
+            half = len(block) // 2
+            self.blocks[index + 1:index + 1] = [block[half:]]
+            self.rows[index + 1:index + 1] = [rows[half:]]
+            del block[half:], rows[half:]
+            self.maxes[index:index + 1] = [block[-1], self.blocks[index + 1][-1]]
+
+    def iter_from(self, name):
+        """(name, row) pairs from the first name not below name, in order"""
+        index = bisect.bisect_left(self.maxes, name)
+        if index == len(self.blocks):
+            return
+        pos = bisect.bisect_left(self.blocks[index], name)
+        for block, rows in zip(self.blocks[index:], self.rows[index:]):
+            yield from zip(block[pos:], rows[pos:])
+            pos = 0
+
+class ProductIndex:
+    """In-memory lookup structures over a ColumnarTable of products"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.products = ColumnarTable(Product)
+        self.by_barcode = {}
+        self.by_sku = {}
+        # Normalized names kept sorted for prefix search, with the matching row ids alongside
+        self.names = SortedNames()
+        # Trigram -> row ids containing it, and the number of distinct trigrams per row
+        self.postings = {}
+        self.gram_counts = array('H')
+
+    def index_row(self, product):
+        """Add a product to the exact-match and trigram structures, returning its row id"""
+        row = len(self.products)
+        self.products.append(product)
+        if product.barcode:
+            self.by_barcode[product.barcode] = row
+        if product.sku:
+            self.by_sku[product.sku.upper()] = row
+        name = normalize(product.name or "")
+        grams = trigrams(name)
+        for gram in grams:
+            self.postings.setdefault(gram, array('i')).append(row)
+        self.gram_counts.append(min(len(grams), 0xFFFF))
+        return row, name
+
+    def extend(self, products):
+        """Bulk-index products, sorting the name list once at the end"""
+        names = list(self.names)
+        for product in products:
+            row, name = self.index_row(product)
+            names.append((name, row))
+        self.names = SortedNames(names)
+
+    def add(self, product, journal=True):
+        """Index one product; later products with the same SKU or barcode replace earlier ones"""
+        row, name = self.index_row(product)
+        self.names.insert(name, row)
+
+        if journal and self.path:
+            with open(self.path + ".journal", 'a', encoding='utf-8') as file:
+                file.write(json.dumps(product_to_json(product)) + "\n")
+        return row
+
+    def is_current(self, row):
+        """False for rows superseded by a later product with the same SKU or barcode"""
+        sku = self.products.columns["sku"].get(row)
+        if sku and self.by_sku.get(sku.upper()) != row:
+            return False
+        barcode = self.products.columns["barcode"].get(row)
+        return not barcode or self.by_barcode.get(barcode) == row
+
+    def lookup_barcode(self, barcode):
+        row = self.by_barcode.get(str(barcode).strip())
+        return None if row is None else self.products[row]
+
+    def lookup_sku(self, sku):
+        row = self.by_sku.get(str(sku).strip().upper())
+        return None if row is None else self.products[row]
+
+    def lookup(self, code):
+        """Resolve a scanned code as a barcode first, then as a SKU"""
+        return self.lookup_barcode(code) or self.lookup_sku(code)
+
+    def search_prefix(self, prefix, limit=10):
+        """Products whose name starts with prefix, in name order"""
+        prefix = normalize(prefix)
+        results = []
+        for name, row in self.names.iter_from(prefix):
+            if len(results) >= limit or not name.startswith(prefix):
+                break
+            if self.is_current(row):
+                results.append(self.products[row])
+        return results
+
+    def similarity(self, query, row):
+        """Dice coefficient of a query's trigrams and a product name's"""
+        # A query trigram occurs in the name exactly when it is a substring of the padded name
+        padded = f"  {normalize(self.products.columns['name'].get(row) or '')} "
+        shared = len([gram for gram in query if gram in padded])
+        return 2 * shared / (len(query) + self.gram_counts[row])
+
+    def search_fuzzy(self, text, limit=10):
+        """Products with names most similar to text by trigram overlap, best first"""
+        query = trigrams(normalize(text))
+        # Rarest trigrams first: they are the most selective and the cheapest to scan
+        grams = sorted((gram for gram in query if gram in self.postings), key=lambda gram: len(self.postings[gram]))
+        if not grams:
+            return []
+        # An edit changes at most 3 trigrams, so a name within FUZZY_MAX_EDITS edits misses at most
+        # 3 * FUZZY_MAX_EDITS query trigrams, fewer once the query's own unknown trigrams are counted.
+        # It is then in the postings of at least one of any that many + 1, so scanning the rarest
+        # ones in full finds every such name whatever its row id
+        misses = max(0, 3 * FUZZY_MAX_EDITS - (len(query) - len(grams)))
+        postings = [np.frombuffer(self.postings[gram], dtype=np.int32) for gram in grams]
+        rows, shared = np.unique(np.concatenate(postings[:misses + 1]), return_counts=True)
+        # The rows sharing the most of them are scored whatever else they share
+        scored = set(rows[np.argsort(-shared, kind='stable')[:limit * 5]].tolist())
+        # The common trigrams are only checked against the rows that can still be that close, which
+        # drop out as soon as they lack more than that many of the trigrams checked so far
+        for checked, posting in enumerate(postings[misses + 1:], misses + 2):
+            alive = shared >= checked - 1 - misses
+            rows, shared = rows[alive], shared[alive]
+            if not len(rows):
+                break
+            # Row ids are appended in order, so posting lists (like the rows) are sorted and
+            # membership is a binary search of the shorter one in the longer
+            if len(posting) < len(rows):
+                found = np.searchsorted(rows, posting)
+                hit = rows[np.minimum(found, len(rows) - 1)] == posting
+                shared[found[hit]] += 1
+            else:
+                found = np.searchsorted(posting, rows)
+                shared += posting[np.minimum(found, len(posting) - 1)] == rows
+        scored.update(rows[shared >= len(grams) - misses].tolist())
+        scored = sorted(((self.similarity(query, row), row) for row in scored), key=lambda item: (-item[0], item[1]))
+        # Superseded rows are rare, so they are only checked for while taking the best matches
+        results = []
+        for _, row in scored:
+            if len(results) >= limit:
+                break
+            if self.is_current(row):
+                results.append(self.products[row])
+        return results
+
+    def search(self, text, limit=10):
+        """QuickAdd entry point: exact code match, then name prefix, then fuzzy name match"""
+        product = self.lookup(text)
+        if product is not None:
+            return [product]
+        return self.search_prefix(text, limit) or self.search_fuzzy(text, limit)
+
+    def save(self, path=None):
+        """Write a full snapshot and start a new empty journal"""
+        path = path or self.path
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump((self.products, self.by_barcode, self.by_sku,
+                         self.names.blocks, self.names.rows, self.postings, self.gram_counts),
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        if os.path.exists(path + ".journal"):
+            os.remove(path + ".journal")
+        self.path = path
+
+    @classmethod
+    def load(cls, path):
+        """Load the snapshot and replay any products journaled since"""
+        index = cls(path)
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                (index.products, index.by_barcode, index.by_sku,
+                 blocks, rows, index.postings, index.gram_counts) = pickle.load(file)
+            index.names = SortedNames.from_blocks(blocks, rows)
+        if os.path.exists(path + ".journal"):
+            with open(path + ".journal", 'r', encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        index.add(product_from_json(json.loads(line)), journal=False)
+        return index
+
+def product_to_json(product):
+    """Journal entry for one product"""
+    values = dict(zip(product.fields(), product.to_row()))
+    if values.get("expiry_date") is not None:
+        values["expiry_date"] = values["expiry_date"].isoformat()
+    return values
+
+def product_from_json(values):
+    if values.get("expiry_date"):
+        values["expiry_date"] = date.fromisoformat(values["expiry_date"])
+    return Product(**values)
+
+def build_index(products_path, index_path):
+    """Build and save an index from the Products sheet of a workbook or CSV"""
+    index = ProductIndex(index_path)
+    index.extend(iter_records(products_path, Product))
+    index.save()
+    return index
+
+if __name__ == "__main__":
+    products_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets", "Products.csv")
+    index_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "product_index.pkl")
+    start = time.perf_counter()
+    index = build_index(products_path, index_path)
+    print(f"Indexed {len(index.products):,} products in {time.perf_counter() - start:.2f}s -> {index_path}")
+
+    sample = index.products[len(index.products) // 2]
+    for label, query in [("barcode", lambda: index.lookup(sample.barcode)),
+                         ("sku", lambda: index.lookup_sku(sample.sku)),
+                         ("prefix", lambda: index.search_prefix(sample.name[:6])),
+                         ("fuzzy", lambda: index.search_fuzzy(sample.name[:-2] + "x"))]:
+        runs = 1000
+        start = time.perf_counter()
+        for _ in range(runs):
+            query()
+        print(f"{label:8s} {(time.perf_counter() - start) / runs * 1e6:8.1f} us/lookup")
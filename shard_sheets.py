@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Sheet Sharding
+Splits tables too large for one worksheet into shards by row range or by a column such as category
+or supplier, and writes an index sheet linking every shard with its row count and totals.
+"""
+
+import csv
+import os
+import re
+import tempfile
+
+from openpyxl.utils import get_column_letter
+
+from import_workbook import locate_header, locate_table, iter_table_rows
+from inventory_model import parse_text
+from sheet_layouts import LAYOUTS, apply_style
+
+# Excel's hard limit per worksheet
+EXCEL_MAX_ROWS = 1048576
+# Table rows per shard; far below the limit so each shard stays quick to open
+SHARD_ROWS = 250000
+
+# Columns summed per shard on the index sheet
+SHARD_TOTALS = {
+    "Inventory": ("Current Stock", "Total Value"),
+    "QuickAdd": ("Change",),
+    "Reorder": ("Order Qty", "Total Cost"),
+}
+
+# Title suffix marking a sheet that lists shards in place of its table
+INDEX_SUFFIX = " - INDEX"
+
+# Characters Excel refuses in sheet names, plus path separators for shard file names
+INVALID_NAME_CHARS = re.compile(r'[\\/?*\[\]:<>"|]')
+
+class Shard:
+    """One slice of a table: its label, row count, per-column totals and where it was written"""
+
+    def __init__(self, label):
+        self.label = label
+        self.count = 0
+        self.totals = {}
+        # Table rows of a shard split from rows in memory; a streamed table re-reads them from its CSV
+        self.rows = None
+        # Sheet title or companion workbook path, and the hyperlink the index sheet points at
+        self.title = None
+        self.path = None
+        self.link = None
+
+    def add(self, count, totals):
+        self.count += count
+        for header, value in totals.items():
+            self.totals[header] = self.totals.get(header, 0) + value
+
+class ShardPlanner:
+    """Row counts and column totals per group, and per run of shard_rows rows within a group
+
+    Groups are the labels of the by column, or one group when splitting by row range. Only counts and
+    totals are kept, so a table can be planned while it is streamed from its CSV. row_totals, if given,
+    maps a row's record to the values of total columns that are rewritten when the shards are built.
+    """
+
+    def __init__(self, record_cls, positions, by, shard_rows, row_totals=None):
+        self.record_cls = record_cls
+        self.positions = positions
+        self.row_totals = row_totals
+        columns = {attr: pos for (_, attr, _), pos in zip(record_cls.COLUMNS, positions)}
+        self.pos = columns.get(by)
+        self.by = by if self.pos is not None else "rows"
+        self.shard_rows = shard_rows
+        converters = {header: (pos, convert) for (header, _, convert), pos in zip(record_cls.COLUMNS, positions)}
+        self.totals = [(header,) + converters[header] for header in SHARD_TOTALS.get(record_cls.SHEET, ())]
+        # Group label -> [rows, [totals of each run of shard_rows rows]], and the shards of each group
+        self.groups = {}
+        self.routes = {}
+
+    def label(self, row):
+        if self.pos is None:
+            return None
+        label = parse_text(row[self.pos]) if self.pos < len(row) else None
+        return label or "Unassigned"
+
+    def add(self, row):
+        group = self.groups.setdefault(self.label(row), [0, []])
+        if group[0] % self.shard_rows == 0:
+            group[1].append(dict.fromkeys((header for header, _, _ in self.totals), 0))
+        totals = group[1][-1]
+        rewritten = self.row_totals(self.record_cls.from_row(row, self.positions)) if self.row_totals else {}
+        for header, pos, convert in self.totals:
+            if header in rewritten:
+                value = rewritten[header]
+            else:
+                value = convert(row[pos]) if pos is not None and pos < len(row) else None
+            if value is not None:
+                totals[header] += value
+        group[0] += 1
+
+    def plan(self):
+        """Shards in label order: groups packed up to shard_rows rows, a longer group split on its own"""
+        shards = []
+        packed, packed_labels = None, []
+        for label in sorted(self.groups, key=lambda label: label or ""):
+            count, runs = self.groups[label]
+            if count > self.shard_rows:
+                self.routes[label] = []
+                for number, totals in enumerate(runs):
+                    start = number * self.shard_rows
+                    rows = min(self.shard_rows, count - start)
+                    shard = Shard(f"Rows {start + 1:,}-{start + rows:,}" if label is None else f"{label} {number + 1}")
+                    shard.add(rows, totals)
+                    shards.append(shard)
+                    self.routes[label].append(shard)
+                continue
+            if packed is None or packed.count + count > self.shard_rows:
+                if packed is not None:
+                    packed.label = pack_label(packed_labels)
+                packed, packed_labels = Shard(None), []
+                shards.append(packed)
+            packed.add(count, runs[0])
+            packed_labels.append(label)
+            self.routes[label] = [packed]
+        if packed is not None:
+            packed.label = pack_label(packed_labels)
+        for shard in shards:
+            shard.totals = {header: round(value, 2) for header, value in shard.totals.items()}
+        return shards
+
+    def route(self, row, seen):
+        """Shard of one table row; seen counts the rows of each group routed so far"""
+        label = self.label(row)
+        number = seen.get(label, 0)
+        seen[label] = number + 1
+        return self.routes[label][number // self.shard_rows]
+
+class ShardedTable:
+    """Rows above the table (title, header), the table split into shards, and the rows after it
+
+    The table rows are either held by each shard or, for a table planned while streaming its CSV,
+    read back from csv_path one shard at a time.
+    """
+
+    def __init__(self, head, shards, tail, by, planner=None, csv_path=None):
+        self.head = head
+        self.shards = shards
+        self.tail = tail
+        self.by = by
+        self.planner = planner
+        self.csv_path = csv_path
+
+    def shard_rows(self, shard, rows=None):
+        """Full sheet rows for one shard; the rows after the table go with the last shard"""
+        rows = self.head + (shard.rows if rows is None else rows)
+        return rows + self.tail if shard is self.shards[-1] else rows
+
+    def iter_shards(self):
+        """Yield (shard, full sheet rows) in shard order, holding one shard's rows at a time"""
+        if self.csv_path is None:
+            for shard in self.shards:
+                yield shard, self.shard_rows(shard)
+        elif self.by == "rows":
+            # Row-range shards follow the table order, so they are cut from one more pass over the CSV
+            shards = iter(self.shards)
+            shard, rows = next(shards), []
+            for row in self.iter_table():
+                rows.append(row)
+                if len(rows) == shard.count:
+                    yield shard, self.shard_rows(shard, rows)
+                    shard, rows = next(shards, None), []
+        else:
+            yield from self.iter_spilled()
+
+    def iter_table(self):
+        with open(self.csv_path, 'r', encoding='utf-8', newline='') as file:
+            for _, row, _ in iter_table_rows(csv.reader(file), self.planner.record_cls):
+                yield row
+
+    def iter_spilled(self):
+        """Route the table rows into one temporary CSV per shard, then read the shards back in order"""
+        with tempfile.TemporaryDirectory() as spill_dir:
+            files = {}
+            try:
+                for number, shard in enumerate(self.shards):
+                    files[shard] = open(os.path.join(spill_dir, f"{number}.csv"), 'w', encoding='utf-8', newline='')
+                writers = {shard: csv.writer(file) for shard, file in files.items()}
+                seen = {}
+                for row in self.iter_table():
+                    writers[self.planner.route(row, seen)].writerow(row)
+            finally:
+                for file in files.values():
+                    file.close()
+            for shard, file in files.items():
+                with open(file.name, 'r', encoding='utf-8', newline='') as spilled:
+                    yield shard, self.shard_rows(shard, list(csv.reader(spilled)))
+
+def shard_table(rows, record_cls, by="rows", shard_rows=SHARD_ROWS, row_totals=None):
+    """Split a sheet's rows into shards when its record_cls table has more than shard_rows rows, else None
+
+    by is "rows" or a column attribute such as "category" or "supplier"; tables without that column
+    are split by row range. Groups are packed in label order into shards of up to shard_rows rows, and
+    a group longer than shard_rows is split by row range into shards of its own. row_totals is passed
+    to the ShardPlanner.
+    """
+    numbered = list(iter_table_rows(rows, record_cls))
+    if len(numbered) <= shard_rows:
+        return None
+    first, last, positions = numbered[0][0], numbered[-1][0], numbered[0][2]
+    head, tail = rows[:first - 1], rows[last:]
+    check_fits(head, tail, shard_rows)
+
+    planner = ShardPlanner(record_cls, positions, by, shard_rows, row_totals)
+    for _, row, _ in numbered:
+        planner.add(row)
+    shards = planner.plan()
+    for shard in shards:
+        shard.rows = []
+    seen = {}
+    for _, row, _ in numbered:
+        planner.route(row, seen).rows.append(row)
+    return ShardedTable(head, shards, tail, planner.by)
+
+def read_sheet(csv_path, record_cls=None, by="rows", shard_rows=SHARD_ROWS, row_totals=None):
+    """Rows of a sheet CSV, or a ShardedTable when its record_cls table has more than shard_rows rows
+
+    A sharded table is planned in one streaming pass that keeps only the rows outside the table and the
+    per-group counts and totals; its shards are read back from the CSV when they are written.
+    """
+    try:
+        file = open(csv_path, 'r', encoding='utf-8', newline='')
+    except OSError as e:
+        print(f"Error reading {csv_path}: {e}")
+        return []
+    with file:
+        reader = csv.reader(file)
+        if record_cls is None:
+            return list(reader)
+        rows, tail = [], []
+        positions = key_pos = planner = None
+        for row in reader:
+            if positions is None:
+                rows.append(row)
+                positions = locate_header(row, record_cls)
+                if positions is not None:
+                    key_pos = positions[0]
+                    head_rows = len(rows)
+                continue
+            if tail:
+                tail.append(row)
+                continue
+            key = row[key_pos] if key_pos < len(row) else None
+            if not key or not key.strip():
+                # Same rule as iter_table_rows: spacer rows before the data belong to the head,
+                # the first blank row after data ends the table
+                if len(rows) > head_rows or planner is not None:
+                    tail.append(row)
+                else:
+                    rows.append(row)
+                    head_rows += 1
+                continue
+            if planner is None:
+                rows.append(row)
+                if len(rows) - head_rows <= shard_rows:
+                    continue
+                planner = ShardPlanner(record_cls, positions, by, shard_rows, row_totals)
+                for table_row in rows[head_rows:]:
+                    planner.add(table_row)
+                del rows[head_rows:]
+                continue
+            planner.add(row)
+    if planner is None:
+        return rows + tail
+    check_fits(rows, tail, shard_rows)
+    return ShardedTable(rows, planner.plan(), tail, planner.by, planner, csv_path)
+
+def check_fits(head, tail, shard_rows):
+    if len(head) + shard_rows + len(tail) > EXCEL_MAX_ROWS:
+        raise ValueError(f"Shards of {shard_rows:,} rows would not fit on a worksheet of {EXCEL_MAX_ROWS:,} rows")
+
+def pack_label(labels):
+    """Label of a shard packed from several groups: the first and last group in label order"""
+    return labels[0] if len(labels) == 1 else f"{labels[0]} - {labels[-1]}"
+
+def safe_name(text, limit):
+    return INVALID_NAME_CHARS.sub("-", text).strip()[:limit].strip()
+
+def shard_title(taken, sheet_name, label):
+    """Sheet title of at most 31 characters for a shard, not among the taken titles"""
+    base = safe_name(f"{sheet_name} {label}", 31)
+    title, copy = base, 2
+    while title in taken:
+        suffix = f" ({copy})"
+        title, copy = base[:31 - len(suffix)] + suffix, copy + 1
+    return title
+
+def sheet_link(title):
+    """Hyperlink to cell A1 of a sheet in the same workbook"""
+    escaped = title.replace("'", "''")
+    return f"#'{escaped}'!A1"
+
+def shard_filename(sheet_name, number, label):
+    return f"{safe_name(f'{sheet_name} {number:03d} {label}', 120)}.xlsx"
+
+def add_index_sheet(wb, sheet_name, table, styles, index=None):
+    """Sheet listing the shards with row counts, totals and hyperlinks, in place of the full table"""
+    ws = wb.create_sheet(title=sheet_name, index=index)
+    title = LAYOUTS[sheet_name].title if sheet_name in LAYOUTS else sheet_name
+    total_rows = sum(shard.count for shard in table.shards)
+    ws['A1'] = f"{title}{INDEX_SUFFIX}"
+    ws['A2'] = f"{total_rows:,} rows in {len(table.shards)} shards by {table.by.replace('_', ' ')}"
+
+    total_headers = list(table.shards[0].totals)
+    headers = ["Shard", "Rows"] + total_headers + ["Open"]
+    for col, header in enumerate(headers, 1):
+        ws.cell(row=4, column=col, value=header)
+    for row_number, shard in enumerate(table.shards, 5):
+        values = [shard.label, shard.count] + [shard.totals[header] for header in total_headers]
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row_number, column=col, value=value)
+        link = ws.cell(row=row_number, column=len(headers), value=shard.title or os.path.basename(shard.path))
+        link.hyperlink = shard.link
+        link.style = "Hyperlink"
+    totals_row = 5 + len(table.shards)
+    ws.cell(row=totals_row, column=1, value="TOTAL")
+    ws.cell(row=totals_row, column=2, value=total_rows)
+    for col, header in enumerate(total_headers, 3):
+        ws.cell(row=totals_row, column=col, value=round(sum(shard.totals[header] for shard in table.shards), 2))
+
+    width = len(headers)
+    if "title" in styles:
+        apply_style(ws, styles["title"], 1, 1, 1, 1)
+        ws.merge_cells(f"A1:{get_column_letter(width)}1")
+    if "table_header" in styles:
+        apply_style(ws, styles["table_header"], 4, 4, 1, width)
+        apply_style(ws, styles["table_header"], totals_row, totals_row, 1, width - 1)
+    if "data" in styles:
+        apply_style(ws, styles["data"], 5, totals_row - 1, 1, width - 1)
+    for col, header in enumerate(headers, 1):
+        longest = max([len(header)] + [len(str(ws.cell(row=row, column=col).value or "")) for row in range(5, totals_row + 1)])
+        ws.column_dimensions[get_column_letter(col)].width = min(longest + 2, 50)
+    return ws
+
+def table_worksheets(wb, sheet_name):
+    """Worksheets holding a sheet's table: the sheet itself, or the shard sheets its index links to
+
+    Shards written as companion workbooks are not part of wb and are left out.
+    """
+    ws = wb[sheet_name]
+    if not str(ws['A1'].value or "").endswith(INDEX_SUFFIX):
+        return [ws]
+    shards = []
+    for row in ws.iter_rows(min_row=5):
+        link = row[-1].hyperlink
+        target = link.target if link is not None else None
+        if target and target.startswith("#"):
+            title = target[1:].rsplit("!", 1)[0]
+            if title.startswith("'"):
+                title = title[1:-1].replace("''", "'")
+            if title in wb.sheetnames:
+                shards.append(wb[title])
+    return shards
+
+def table_records(wb, record_cls):
+    """Records of a table across its worksheet or in-workbook shards"""
+    if record_cls.SHEET not in wb.sheetnames:
+        return []
+    return [record for ws in table_worksheets(wb, record_cls.SHEET) for _, record in locate_table(ws, record_cls)[1]]
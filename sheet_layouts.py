@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Sheet Layouts
+Declarative per-sheet layout specs (title, table, status columns, section markers) compiled into
+range-level formatting operations, so formatting follows the data however many rows a sheet has.
+"""
+
+from openpyxl.styles import PatternFill
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils import get_column_letter, column_index_from_string
+
+from import_workbook import locate_header, iter_table_rows
+from inventory_model import Category, Supplier, Product, InventoryItem, ReorderItem, Transaction
+
+# Column widths are measured on at most this many table rows
+WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 50
+
+# Status role for a value, by its leading marker or by its whole text
+STATUS_MARKERS = {"🟢": "good", "🟡": "warning", "🔴": "critical"}
+STATUS_LABELS = {
+    "Healthy": "good",
+    "Healthy Stock": "good",
+    "Low Stock": "warning",
+    "At Minimum": "warning",
+    "Out of Stock": "critical",
+}
+STATUS_FILLS = {"good": "E8F5E8", "warning": "FFF3CD", "critical": "F8D7DA"}
+# Roles set attribute by attribute on every cell of their ranges, keeping each cell's other styling
+OVERLAY_ROLES = {"values"}
+
+class SheetLayout:
+    """Where the title, table, status values and section headers of one sheet are"""
+
+    def __init__(self, title, width, record_cls=None, status_columns=(), status_rows=False,
+                 section_columns=("A",), section_markers=()):
+        # Title text in column A of one of the first rows, merged across width columns
+        self.title = title
+        self.width = width
+        # Record type whose header row and data rows make up the sheet's table
+        self.record_cls = record_cls
+        # Columns holding status values; with status_rows the whole table row takes the status colour
+        self.status_columns = tuple(column_index_from_string(col) for col in status_columns)
+        self.status_rows = status_rows
+        # Section headers: upper-case text starting with one of the markers, in one of the section columns
+        self.section_columns = tuple(column_index_from_string(col) for col in section_columns)
+        self.section_markers = tuple(section_markers)
+
+LAYOUTS = {
+    "Dashboard": SheetLayout("🏠 BEAUTY PRO DASHBOARD", 10, status_columns=("A", "G"),
+                             section_columns=("A", "D", "F", "G", "I"),
+                             section_markers=("📊", "📈", "📋", "⚠️", "🏪", "💰", "📅", "💡")),
+    "Categories": SheetLayout("📂 MY CATEGORIES", 8, Category, section_markers=("🎯", "💡")),
+    "Suppliers": SheetLayout("🏪 MY SUPPLIERS", 10, Supplier, section_markers=("🔧", "📊", "💡")),
+    "Products": SheetLayout("💄 MY PRODUCTS", 14, Product, section_markers=("🎯", "💡", "📊")),
+    "Inventory": SheetLayout("📦 LIVE INVENTORY", 15, InventoryItem, status_columns=("F",),
+                             section_markers=("📊", "📋")),
+    "QuickAdd": SheetLayout("➕ QUICK ADD INVENTORY", 8, Transaction, section_markers=("🚀", "📋", "📱", "💡")),
+    "Reorder": SheetLayout("🔄 REORDER DASHBOARD", 10, ReorderItem, status_columns=("I",), status_rows=True,
+                           section_markers=("📋", "📊", "🏪", "📅", "💡", "📧")),
+    "Analytics": SheetLayout("📈 BUSINESS ANALYTICS", 10, status_columns=("D",),
+                             section_markers=("📊", "🎯", "🏆", "📉", "📅", "💰", "📈")),
+    "Instructions": SheetLayout("📖 SETUP INSTRUCTIONS", 10, section_markers=("🎯", "📱", "🔧", "🎨", "🆘", "📞")),
+}
+
+def status_styles():
+    """Fill roles for status values, shared by every builder"""
+    return {role: {"fill": PatternFill(start_color=color, end_color=color, fill_type="solid")}
+            for role, color in STATUS_FILLS.items()}
+
+def status_role(value):
+    """good / warning / critical for a status value, or None"""
+    if value is None:
+        return None
+    text = str(value).strip()
+    return STATUS_MARKERS.get(text[:1]) or STATUS_LABELS.get(text)
+
+def is_section(value, markers):
+    return isinstance(value, str) and value.startswith(markers) and value == value.upper()
+
+class CompiledLayout:
+    """Formatting operations for one sheet, plus where its title and table were found"""
+
+    def __init__(self):
+        self.title_row = None
+        self.header_row = None
+        self.data_rows = range(0)
+        # ("style", role, min_row, max_row, min_col, max_col), ("merge", range), ("width", letter, width)
+        self.operations = []
+
+    def add_style(self, role, min_row, max_row, min_col, max_col):
+        self.operations.append(("style", role, min_row, max_row, min_col, max_col))
+
+def compile_layout(ws, layout, values_from_row=None, min_width=None):
+    """Read the sheet values once and turn the layout into range operations
+
+    values_from_row adds a "values" role over the non-empty cells from that row down, and min_width
+    is the narrowest width given to any column up to the last one used.
+    """
+    compiled = CompiledLayout()
+    rows = list(ws.iter_rows(values_only=True))
+
+    for row_number, row in enumerate(rows[:5], 1):
+        if row and row[0] == layout.title:
+            compiled.title_row = row_number
+            break
+
+    if layout.record_cls is not None:
+        for row_number, row in enumerate(rows, 1):
+            if locate_header(row, layout.record_cls) is not None:
+                compiled.header_row = row_number
+                break
+        numbered = [row_number for row_number, _, _ in iter_table_rows(rows, layout.record_cls)]
+        if numbered:
+            compiled.data_rows = range(numbered[0], numbered[-1] + 1)
+
+    if compiled.title_row is not None:
+        compiled.add_style("title", compiled.title_row, compiled.title_row, 1, 1)
+        compiled.operations.append(("merge", f"A{compiled.title_row}:{get_column_letter(layout.width)}{compiled.title_row}"))
+    if compiled.header_row is not None:
+        compiled.add_style("table_header", compiled.header_row, compiled.header_row, 1, layout.width)
+    if compiled.data_rows:
+        compiled.add_style("data", compiled.data_rows.start, compiled.data_rows.stop - 1, 1, layout.width)
+
+    # Status colours, merging runs of equal status in a column into one range
+    status_scope = compiled.data_rows if layout.record_cls is not None else range(1, len(rows) + 1)
+    for col in layout.status_columns:
+        runs = []
+        for row_number in status_scope:
+            row = rows[row_number - 1]
+            role = status_role(row[col - 1]) if col <= len(row) else None
+            if role is None:
+                continue
+            if runs and runs[-1][0] == role and runs[-1][2] == row_number - 1:
+                runs[-1][2] = row_number
+            else:
+                runs.append([role, row_number, row_number])
+        first_col, last_col = (1, layout.width) if layout.status_rows else (col, col)
+        for role, start, end in runs:
+            compiled.add_style(role, start, end, first_col, last_col)
+
+    # Section headers outside the table
+    table = range(compiled.header_row or 0, compiled.data_rows.stop if compiled.data_rows else (compiled.header_row or 0) + 1)
+    for row_number, row in enumerate(rows, 1):
+        if row_number in table or row_number == compiled.title_row:
+            continue
+        for col in layout.section_columns:
+            if col <= len(row) and is_section(row[col - 1], layout.section_markers):
+                compiled.add_style("section", row_number, row_number, col, col)
+
+    # Runs of non-empty cells anywhere below values_from_row
+    if values_from_row is not None:
+        for row_number, row in enumerate(rows[values_from_row - 1:], values_from_row):
+            start = None
+            for col, value in enumerate(list(row) + [None], 1):
+                if value and start is None:
+                    start = col
+                elif not value and start is not None:
+                    compiled.add_style("values", row_number, row_number, start, col - 1)
+                    start = None
+
+    # Column widths from everything outside the table plus a sample of its rows
+    widths = {}
+    sampled = range(compiled.data_rows.start + WIDTH_SAMPLE_ROWS, compiled.data_rows.stop) if compiled.data_rows else range(0)
+    for row_number, row in enumerate(rows, 1):
+        if row_number in sampled:
+            continue
+        for col, value in enumerate(row, 1):
+            if value is not None:
+                widths[col] = max(widths.get(col, 0), len(str(value)))
+    if min_width is not None:
+        for col in range(1, max((len(row) for row in rows), default=0) + 1):
+            widths[col] = max(widths.get(col, 0), min_width - 2)
+    for col, width in sorted(widths.items()):
+        compiled.operations.append(("width", get_column_letter(col), min(width + 2, MAX_COLUMN_WIDTH)))
+    return compiled
+
+def apply_style(ws, attributes, min_row, max_row, min_col, max_col):
+    """Style the first cell of a range, then copy its style to the rest of the range"""
+    anchor = ws.cell(row=min_row, column=min_col)
+    for attr, value in attributes.items():
+        setattr(anchor, attr, value)
+    if min_row == max_row and min_col == max_col:
+        return
+    style = anchor._style
+    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+        for cell in row:
+            if cell is not anchor:
+                cell._style = StyleArray(style)
+
+def overlay_style(ws, attributes, min_row, max_row, min_col, max_col):
+    """Set the attributes on every cell of a range, leaving the rest of each cell's style alone"""
+    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+        for cell in row:
+            for attr, value in attributes.items():
+                setattr(cell, attr, value)
+
+def apply_layout(ws, compiled, styles, merge=True, widths=True):
+    """Run the compiled operations; roles missing from styles are left as they are"""
+    for operation in compiled.operations:
+        if operation[0] == "style":
+            _, role, min_row, max_row, min_col, max_col = operation
+            if role in OVERLAY_ROLES and role in styles:
+                overlay_style(ws, styles[role], min_row, max_row, min_col, max_col)
+            elif role in styles:
+                apply_style(ws, styles[role], min_row, max_row, min_col, max_col)
+        elif operation[0] == "merge" and merge:
+            ws.merge_cells(operation[1])
+        elif operation[0] == "width" and widths:
+            ws.column_dimensions[operation[1]].width = operation[2]
+
+def format_with_layout(ws, sheet_name, styles, merge=True, widths=True, values_from_row=None, min_width=None):
+    """Compile the sheet's layout and apply it, returning the compiled layout"""
+    compiled = compile_layout(ws, LAYOUTS[sheet_name], values_from_row, min_width)
+    apply_layout(ws, compiled, styles, merge, widths)
+    return compiled
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Stock Store
+Applies QuickAdd "UPDATE STOCK" transactions to current stock levels held in memory.
+Updates are serialized by a lock so concurrent tills never overwrite each other's changes.
+"""
+
+import threading
+from array import array
+from datetime import date
+
+from inventory_model import Transaction
+
+# Transaction types offered by QuickAdd and the sign their quantity change must have
+TRANSACTION_TYPES = {
+    "Stock Received": 1,
+    "Sale": -1,
+    "Damaged": -1,
+    "Adjustment": 0,
+}
+
+class StockStore:
+    """Current stock per product plus the log of applied transactions"""
+
+    def __init__(self, items):
+        self.names = []
+        self.positions = {}
+        self.stock = array('q')
+        self.min_stock = array('q')
+        self.unit_cost = array('d')
+        for item in items:
+            self.positions[item.name] = len(self.names)
+            self.names.append(item.name)
+            self.stock.append(item.current_stock or 0)
+            self.min_stock.append(item.min_stock or 0)
+            self.unit_cost.append(item.cost or 0.0)
+        self.transactions = []
+        self.lock = threading.Lock()
+
+    def apply(self, product, change, kind, user="System", notes=None, day=None):
+        """Apply one stock update and return its Transaction; stock never goes below zero"""
+        sign = TRANSACTION_TYPES.get(kind)
+        if sign is None:
+            raise ValueError(f"Unknown transaction type {kind!r}, expected one of {', '.join(TRANSACTION_TYPES)}")
+        if sign and change * sign <= 0:
+            raise ValueError(f"{kind} needs a {'positive' if sign > 0 else 'negative'} quantity change, got {change}")
+        pos = self.positions.get(product)
+        if pos is None:
+            raise KeyError(f"Unknown product {product!r}")
+
+        with self.lock:
+            new_stock = self.stock[pos] + change
+            if new_stock < 0:
+                raise ValueError(f"Only {self.stock[pos]} units of {product} in stock")
+            self.stock[pos] = new_stock
+            transaction = Transaction(date=day or date.today(), product=product, change=change, type=kind,
+                                      new_stock=new_stock, user=user, notes=notes)
+            self.transactions.append(transaction)
+        return transaction
+
+    def current_stock(self, product):
+        return self.stock[self.positions[product]]
+
+    def snapshot(self):
+        """Consistent copy of every stock level and the number of transactions it includes"""
+        with self.lock:
+            return array('q', self.stock), len(self.transactions)
+
+    def low_stock(self):
+        """Names of products at or below their minimum stock"""
+        stock, _ = self.snapshot()
+        return [name for name, level, minimum in zip(self.names, stock, self.min_stock) if level <= minimum]
+
+    def stock_value(self):
+        stock, _ = self.snapshot()
+        return sum(level * cost for level, cost in zip(stock, self.unit_cost))
@@ -0,0 +1,24 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+# The modules live flat in the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def sample_sheets(tmp_path):
+    """Copy of the sample sheet CSVs, so builds keep their rollup store out of the repository"""
+    sheets_dir = tmp_path / "sheets"
+    shutil.copytree(os.path.join(ROOT, "sheets"), sheets_dir, ignore=shutil.ignore_patterns("*.pkl"))
+    return str(sheets_dir)
+
+@pytest.fixture
+def generated_sheets(tmp_path):
+    """Small synthetic catalog with 60 days of sales history"""
+    from generate_catalog import generate_catalog
+    sheets_dir = tmp_path / "generated"
+    generate_catalog(str(sheets_dir), products=300, days=60, seed=1)
+    return str(sheets_dir)
@@ -0,0 +1,66 @@
+import os
+import shutil
+
+from openpyxl import Workbook
+
+from analytics_rollups import (STORE_FILENAME, CATEGORY_HEADERS, RollupStore, load_default_rollups, performance_rows,
+                               category_rows, analytics_sheet_rows)
+from create_excel_workbook import build_workbook, build_worksheet, read_csv_data
+from enhance_excel_workbook import enhance_analytics
+from import_workbook import import_csv_directory
+
+def sheet_values(ws):
+    """Non-empty cell values of each row, as text"""
+    return [[str(value) for value in row if value is not None] for row in ws.iter_rows(values_only=True)]
+
+def test_each_sheets_directory_keeps_its_own_store(sample_sheets, generated_sheets):
+    generated = load_default_rollups(generated_sheets)
+    sample = load_default_rollups(sample_sheets)
+    assert os.path.exists(os.path.join(sample_sheets, STORE_FILENAME))
+    assert os.path.exists(os.path.join(generated_sheets, STORE_FILENAME))
+
+    # The synthetic history must not leak into the sample catalog's rollups
+    sample_skus = {product.sku for _, products in import_csv_directory(sample_sheets, ["Products"]) for product in products}
+    assert set(sample.skus) <= sample_skus
+    assert len(generated.skus) > len(sample_skus)
+    reloaded = RollupStore.load(os.path.join(sample_sheets, STORE_FILENAME))
+    assert performance_rows(reloaded) == performance_rows(sample)
+
+def test_sync_folds_each_day_once(sample_sheets):
+    first = load_default_rollups(sample_sheets)
+    again = load_default_rollups(sample_sheets)
+    for period in first.periods("monthly"):
+        assert again.totals("monthly", period) == first.totals("monthly", period)
+
+def test_basic_build_generates_both_analytics_sections(sample_sheets):
+    rollups = load_default_rollups(sample_sheets)
+    wb = build_workbook(sample_sheets, rollups=rollups)
+    rows = sheet_values(wb["Analytics"])
+    performance = performance_rows(rollups)
+    assert rows[5:5 + len(performance)] == [[str(value) for value in row if value != ""] for row in performance]
+    assert "$18470" not in {value for row in rows[5:5 + len(performance)] for value in row}
+
+    header = rows.index(CATEGORY_HEADERS)
+    categories = category_rows(rollups)
+    assert rows[header + 1:header + 1 + len(categories)] == [[str(value) for value in row] for row in categories]
+    assert rows[header + 1 + len(categories)] == []
+    assert rows[header + 2 + len(categories)] == ["🏆 TOP PERFORMING PRODUCTS"]
+
+def test_category_section_grows_with_the_catalog(sample_sheets, generated_sheets):
+    shutil.copy(os.path.join(sample_sheets, "Analytics.csv"), generated_sheets)
+    rollups = load_default_rollups(generated_sheets)
+    expected = analytics_sheet_rows(read_csv_data(os.path.join(generated_sheets, "Analytics.csv")), rollups)
+    assert len(category_rows(rollups)) > 6
+
+    # The metrics fill in the INVENTORY EFFICIENCY turnover and append their summary after the rollup sections
+    expected = expected[:next(pos for pos, row in enumerate(expected) if row and row[0] == "🎯 INVENTORY EFFICIENCY")]
+    wb = build_workbook(generated_sheets, rollups=rollups)
+    built = sheet_values(wb["Analytics"])
+    assert built[:len(expected)] == [[value for value in row if value] for row in expected]
+
+    # The enhancement stage rewrites a saved workbook's sections the same way, inserting the extra rows
+    template = Workbook()
+    template.remove(template.active)
+    build_worksheet(template, "Analytics", read_csv_data(os.path.join(generated_sheets, "Analytics.csv")))
+    enhance_analytics(template, rollups)
+    assert sheet_values(template["Analytics"])[:len(expected)] == built[:len(expected)]
@@ -0,0 +1,36 @@
+import csv
+
+from diff_snapshots import diff_snapshots
+
+HEADER = ["Date", "Product", "Change", "Type", "New Stock", "User", "Notes"]
+SALE = ["2024-01-15", "OPI Glow Lipstick 2", "-1", "Sale", "", "POS", ""]
+
+def write_quickadd(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["📋 RECENT TRANSACTIONS"])
+        writer.writerow([])
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return str(path)
+
+def diff(tmp_path, old_rows, new_rows):
+    old = write_quickadd(tmp_path / "old.csv", old_rows)
+    new = write_quickadd(tmp_path / "new.csv", new_rows)
+    return diff_snapshots(old, new, ["QuickAdd"])["QuickAdd"]
+
+def kinds(changes):
+    return [(change.kind, change.key) for change in changes]
+
+def test_identical_transactions_are_counted(tmp_path):
+    key = "2024-01-15|OPI Glow Lipstick 2|-1|Sale"
+    assert kinds(diff(tmp_path, [SALE, SALE], [SALE, SALE, SALE])) == [("added", f"{key}#3")]
+
+def test_removed_duplicate_is_reported(tmp_path):
+    key = "2024-01-15|OPI Glow Lipstick 2|-1|Sale"
+    assert kinds(diff(tmp_path, [SALE, SALE], [SALE])) == [("removed", f"{key}#2")]
+
+def test_changed_duplicate_keeps_its_deltas(tmp_path):
+    other_till = SALE[:5] + ["Till 2", ""]
+    changes = diff(tmp_path, [SALE, SALE], [SALE, other_till])
+    assert [(change.kind, change.deltas) for change in changes] == [("changed", {"user": ("POS", "Till 2", None)})]
@@ -0,0 +1,46 @@
+from openpyxl import Workbook
+
+from create_excel_workbook import build_worksheet
+from enhance_excel_workbook import enhance_products, enhance_reorder
+from inventory_model import Product, ReorderItem
+
+def product_rows(count):
+    rows = [["💄 MY PRODUCTS"], [], Product.headers()]
+    for number in range(count):
+        rows.append([f"Product {number}", "Brand", "Lipstick", f"SKU-{number}", "Beauty Supply Co", "$10.00", "$20.00"])
+    return rows
+
+def reorder_rows(count):
+    rows = [["🔄 REORDER DASHBOARD"], [], ReorderItem.headers()]
+    for number in range(count):
+        rows.append([f"Product {number}", "1", "2", "5", "4", "Beauty Supply Co", "$2.50", "$10.00"])
+    rows += [[], ["📊 REORDER SUMMARY"], ["Total Items to Reorder:", str(count), "", "Total Order Value:", "$0.00"]]
+    return rows
+
+def new_workbook(sheet_name, rows):
+    wb = Workbook()
+    wb.remove(wb.active)
+    build_worksheet(wb, sheet_name, rows)
+    return wb
+
+def test_product_totals_go_below_the_table():
+    wb = new_workbook("Products", product_rows(50))
+    enhance_products(wb)
+    ws = wb["Products"]
+    # Rows 4-53 hold products; row 37 is untouched, row 54 stays blank and row 55 holds the totals
+    assert ws["A37"].value == "Product 33"
+    assert ws["H37"].value.startswith("=IF(")
+    assert ws["A54"].value is None
+    assert ws["A55"].value == "TOTALS:"
+    assert ws["B55"].value == "=COUNTA(A4:A53)"
+    assert ws["C55"].value == "=AVERAGE(H4:H53)"
+
+def test_order_total_goes_next_to_its_label():
+    wb = new_workbook("Reorder", reorder_rows(20))
+    enhance_reorder(wb)
+    ws = wb["Reorder"]
+    # Row 15 is a Reorder row whose Order Qty stays as it is
+    assert ws["A15"].value == "Product 11"
+    assert ws["E15"].value == "4"
+    assert ws["D26"].value == "Total Order Value:"
+    assert ws["E26"].value == "$200.00"
@@ -0,0 +1,34 @@
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import openpyxl
+
+from export_tables import export_table, start_exports
+from import_workbook import iter_csv_records
+from inventory_model import InventoryItem
+from parallel_csv import parse_csv_table
+
+def no_workbook(*args, **kwargs):
+    raise AssertionError("exports went through openpyxl")
+
+def test_exports_read_the_sheet_csvs(sample_sheets, tmp_path, monkeypatch):
+    monkeypatch.setattr(openpyxl, "load_workbook", no_workbook)
+    pool, futures = start_exports(sample_sheets, str(tmp_path), formats=["csv", "jsonl"], pool=ThreadPoolExecutor())
+    with pool:
+        paths = sorted(os.path.basename(future.result()) for future in futures)
+    assert paths == ["inventory.csv", "inventory.jsonl", "products.csv", "products.jsonl", "reorder.csv", "reorder.jsonl"]
+
+    expected = list(iter_csv_records(os.path.join(sample_sheets, "Inventory.csv"), InventoryItem))
+    with open(tmp_path / "inventory.csv", 'r', encoding='utf-8', newline='') as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == InventoryItem.headers() and len(rows) == len(expected) + 1
+    with open(tmp_path / "inventory.jsonl", 'r', encoding='utf-8') as file:
+        assert [json.loads(line)["name"] for line in file] == [item.name for item in expected]
+
+def test_exports_take_a_built_table(sample_sheets, tmp_path):
+    table = parse_csv_table(os.path.join(sample_sheets, "Inventory.csv"), InventoryItem)
+    path = export_table(table, "Inventory", "jsonl", str(tmp_path))
+    with open(path, 'r', encoding='utf-8') as file:
+        assert [json.loads(line)["name"] for line in file] == table.column("name")
@@ -0,0 +1,58 @@
+import os
+
+from create_excel_workbook import build_workbook, read_csv_data
+from import_workbook import (import_csv_directory, import_workbook, iter_csv_records, iter_table_records,
+                             iter_table_values, update_numbered_records, iter_numbered_records)
+from inventory_model import Product
+from workbook_io import save_workbook
+
+HEADER = ["Product Name", "Brand", "Category", "SKU", "Supplier", "Cost", "Retail Price"]
+
+def product_rows(names):
+    return [["💄 MY PRODUCTS"], [], HEADER, []] + [[name, "MAC", "Lipstick", f"SKU-{name}", "", "$1.00", "$2.00"]
+                                                   for name in names]
+
+def test_tables_are_found_below_spacer_rows_and_end_at_a_blank_row():
+    rows = product_rows(["A", "B"]) + [[], ["Notes below the table"]]
+    assert [product.name for product in iter_table_records(rows, Product)] == ["A", "B"]
+    assert list(iter_table_values(rows, Product, "cost")) == [1.0, 1.0]
+
+def test_importers_yield_record_iterators(sample_sheets, tmp_path):
+    expected = [product.name for product in iter_csv_records(os.path.join(sample_sheets, "Products.csv"), Product)]
+    tables = import_csv_directory(sample_sheets, ["Products", "Missing"])
+    sheet_name, records = next(tables)
+    assert sheet_name == "Products" and not isinstance(records, list)
+    assert [product.name for product in records] == expected
+    assert list(tables) == []
+
+    wb_path = str(tmp_path / "workbook.xlsx")
+    save_workbook(build_workbook(sample_sheets), wb_path)
+    counts = {sheet_name: sum(1 for _ in records) for sheet_name, records in import_workbook(wb_path, ["Products", "Inventory"])}
+    assert counts["Products"] == len(expected) and counts["Inventory"] > 0
+
+def test_update_parses_only_the_changed_rows():
+    old_rows = product_rows(["A", "B", "C", "D"])
+    numbered = list(iter_numbered_records(old_rows, Product))
+    new_rows = product_rows(["A", "B2", "B3", "C", "D"])
+    updated, removed, added = update_numbered_records(numbered, old_rows, new_rows, Product)
+
+    assert [record.name for _, record in updated] == ["A", "B2", "B3", "C", "D"]
+    assert [row_number for row_number, _ in updated] == [5, 6, 7, 8, 9]
+    assert [record.name for record in removed] == ["B"] and [record.name for record in added] == ["B2", "B3"]
+    kept = {name: record for name, record in ((record.name, record) for _, record in numbered)}
+    assert all(updated[pos][1] is kept[name] for pos, name in [(0, "A"), (3, "C"), (4, "D")])
+
+def test_update_reparses_everything_after_a_header_change(sample_sheets):
+    old_rows = read_csv_data(os.path.join(sample_sheets, "Products.csv"))
+    numbered = list(iter_numbered_records(old_rows, Product))
+    new_rows = [list(row) for row in old_rows]
+    header = next(pos for pos, row in enumerate(new_rows) if row and row[0] == "Product Name")
+    # Swap the Cost and Retail Price columns, header included
+    for row in new_rows[header:]:
+        if len(row) > 6:
+            row[5], row[6] = row[6], row[5]
+    updated, removed, added = update_numbered_records(numbered, old_rows, new_rows, Product)
+
+    assert len(removed) == len(added) == len(numbered)
+    assert [(record.cost, record.retail_price) for _, record in updated] == \
+        [(record.cost, record.retail_price) for _, record in numbered]
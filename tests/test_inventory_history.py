@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+import pytest
+
+import inventory_history
+from inventory_history import InventoryHistory
+from inventory_model import InventoryItem
+
+START = date(2024, 1, 1)
+
+def catalog(stock):
+    return [InventoryItem(name=name, current_stock=level, min_stock=5, cost=2.0) for name, level in stock.items()]
+
+def test_time_travel_through_deltas_and_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(inventory_history, "CHECKPOINT_DAYS", 4)
+    history = InventoryHistory(str(tmp_path))
+    stock = {f"Product {i}": 10 for i in range(20)}
+    states = []
+    kinds = []
+    for offset in range(9):
+        stock[f"Product {offset}"] -= offset
+        if offset == 5:
+            del stock["Product 19"]
+        states.append(dict(stock))
+        kinds.append(history.record(START + timedelta(days=offset), catalog(stock)))
+
+    assert [kind for kind, _ in kinds] == ["checkpoint", "delta", "delta", "delta",
+                                           "checkpoint", "delta", "delta", "delta", "checkpoint"]
+    # Each delta holds only the changed row, plus nothing for the removed product
+    assert [rows for kind, rows in kinds if kind == "delta"] == [1, 1, 1, 1, 1, 1]
+
+    reopened = InventoryHistory(str(tmp_path))
+    for offset, expected in enumerate(states):
+        day = START + timedelta(days=offset)
+        assert reopened.stock_as_of(day) == expected
+        assert reopened.value_as_of(day) == sum(expected.values()) * 2.0
+    assert reopened.stock_as_of(START + timedelta(days=4), "Product 19") == 10
+    assert reopened.stock_as_of(START + timedelta(days=6), "Product 19") is None
+    assert reopened.stock_as_of(START - timedelta(days=1)) == {}
+
+def test_wide_changes_are_stored_as_checkpoints(tmp_path):
+    history = InventoryHistory(str(tmp_path))
+    stock = {f"Product {i}": 10 for i in range(10)}
+    history.record(START, catalog(stock))
+    assert history.record(START + timedelta(days=1), catalog({name: 3 for name in stock})) == ("checkpoint", 10)
+
+def test_days_must_move_forward(tmp_path):
+    history = InventoryHistory(str(tmp_path))
+    history.record(START, catalog({"Product 0": 1}))
+    with pytest.raises(ValueError):
+        history.record(START, catalog({"Product 0": 2}))
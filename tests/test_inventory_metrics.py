@@ -0,0 +1,48 @@
+import os
+import shutil
+
+from analytics_rollups import load_default_rollups
+from create_excel_workbook import build_workbook
+from inventory_metrics import add_inventory_metrics
+
+SAMPLE_SHEETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sheets")
+
+def turnover_rows(wb):
+    """Dashboard and Analytics INVENTORY EFFICIENCY rows of the Inventory Turnover figure"""
+    return [next(row for row in wb[sheet_name].iter_rows() if row[0].value == "Inventory Turnover")
+            for sheet_name in ("Dashboard", "Analytics")]
+
+def reset_sample_figures(wb):
+    """Put back the sample turnover figures the metrics must replace"""
+    dashboard, analytics = turnover_rows(wb)
+    dashboard[1].value = "4.2x"
+    analytics[1].value, analytics[3].value, analytics[4].value = "4.2x", "🟡 Below Target", "+1.8x"
+
+def turnover_values(wb):
+    dashboard, analytics = turnover_rows(wb)
+    return dashboard[1].value, tuple(cell.value for cell in analytics[1:5])
+
+def test_turnover_without_sales_history(sample_sheets):
+    rollups = load_default_rollups(sample_sheets)
+    wb = build_workbook(sample_sheets, rollups=rollups)
+    assert turnover_values(wb) == ("--", ("--", "6.0x", "--", "--"))
+
+    reset_sample_figures(wb)
+    add_inventory_metrics(wb, rollups)
+    assert turnover_values(wb) == ("--", ("--", "6.0x", "--", "--"))
+
+def test_turnover_from_sales_history(generated_sheets):
+    for sheet_name in ("Dashboard", "Analytics", "Instructions"):
+        shutil.copy(os.path.join(SAMPLE_SHEETS, f"{sheet_name}.csv"), generated_sheets)
+    rollups = load_default_rollups(generated_sheets)
+    wb = build_workbook(generated_sheets, rollups=rollups)
+    reset_sample_figures(wb)
+    metrics = add_inventory_metrics(wb, rollups)
+
+    assert metrics.turnover_ready
+    figure = metrics.format_turnover(metrics.total_turnover)
+    if metrics.total_turnover >= 6.0:
+        expected = (figure, "6.0x", "🟢 On Target", "Maintain")
+    else:
+        expected = (figure, "6.0x", "🟡 Below Target", f"+{6.0 - metrics.total_turnover:.1f}x")
+    assert turnover_values(wb) == (figure, expected)
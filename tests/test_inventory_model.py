@@ -0,0 +1,29 @@
+from inventory_model import CategoricalColumn, ColumnarTable, ReorderItem, measure_bytes_per_row
+
+SUPPLIERS = [f"Supplier {i}" for i in range(300)]
+
+def test_categorical_codes_widen_past_256_values():
+    # Appending the 256th distinct value used to write its code into the replaced byte array
+    column = CategoricalColumn()
+    for value in SUPPLIERS + SUPPLIERS[::-1]:
+        column.append(value)
+    assert column.codes.typecode == 'H'
+    assert [column.get(pos) for pos in range(len(SUPPLIERS))] == SUPPLIERS
+
+def test_append_column_recodes_across_the_widening():
+    first, second = CategoricalColumn(), CategoricalColumn()
+    for value in SUPPLIERS[:200]:
+        first.append(value)
+    for value in SUPPLIERS[100:]:
+        second.append(value)
+    first.append_column(second)
+    assert [first.get(pos) for pos in range(len(first.codes))] == SUPPLIERS[:200] + SUPPLIERS[100:]
+
+def test_table_round_trips_a_widened_column():
+    table = ColumnarTable(ReorderItem, (ReorderItem(name=f"Product {i}", supplier=value) for i, value in enumerate(SUPPLIERS)))
+    assert table.column("supplier") == SUPPLIERS
+
+def test_bytes_per_row_measures_both_layouts_alike():
+    list_per_row, table_per_row = measure_bytes_per_row(5000)
+    # Both are traced allocations, so the table's dictionaries and array slack are counted too
+    assert 0 < table_per_row < list_per_row / 5
@@ -0,0 +1,38 @@
+import csv
+
+from import_workbook import iter_csv_records
+from inventory_model import Product
+from parallel_csv import parse_csv_table
+
+HEADER = ["Product Name", "Brand", "Category", "SKU", "Supplier", "Cost", "Retail Price", "Notes"]
+
+def write_products(path, count):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["💄 MY PRODUCTS"])
+        writer.writerow([])
+        writer.writerow(HEADER)
+        writer.writerow([])
+        for i in range(count):
+            # Quoted notes spanning lines, with escaped quotes, must not be split between chunks
+            notes = f'Batch {i}\nsays "shake well"\n' if i % 3 == 0 else ""
+            writer.writerow([f"Product {i}", "MAC", "Lipstick", f"SKU-{i:05d}", "Beauty Supply", f"{i % 40}.50", "$19.00", notes])
+        writer.writerow([])
+        writer.writerow(["Product Name", "Rows below the table are not part of it"])
+    return str(path)
+
+def test_chunks_match_the_streaming_importer(tmp_path):
+    csv_path = write_products(tmp_path / "Products.csv", 2000)
+    expected = list(iter_csv_records(csv_path, Product))
+    for workers in (1, 2):
+        table = parse_csv_table(csv_path, Product, workers=workers, chunk_bytes=4096)
+        assert len(table) == 2000
+        assert list(table) == expected
+
+def test_missing_table_gives_an_empty_table(tmp_path):
+    empty = tmp_path / "Empty.csv"
+    empty.write_text("")
+    notes = tmp_path / "Notes.csv"
+    notes.write_text("Just some notes\n")
+    assert len(parse_csv_table(str(empty), Product)) == 0
+    assert len(parse_csv_table(str(notes), Product)) == 0
@@ -0,0 +1,51 @@
+import random
+import shutil
+
+import pytest
+
+from generate_catalog import generate_catalog
+from product_index import ProductIndex, build_index
+
+def misspell(rng, name, typos):
+    """name with typos characters replaced or dropped"""
+    for _ in range(typos):
+        pos = rng.randrange(len(name))
+        name = name[:pos] + (rng.choice("xqzj") if rng.random() < 0.5 else "") + name[pos + 1:]
+    return name
+
+@pytest.fixture(scope="module")
+def catalog_index(tmp_path_factory):
+    sheets_dir = tmp_path_factory.mktemp("catalog")
+    generate_catalog(str(sheets_dir), products=200000, days=1, seed=3)
+    return build_index(str(sheets_dir / "Products.csv"), str(sheets_dir / "product_index.pkl"))
+
+@pytest.mark.parametrize("typos", [1, 2])
+def test_fuzzy_search_finds_misspelled_names_anywhere_in_the_catalog(catalog_index, typos):
+    rng = random.Random(typos)
+    names = catalog_index.products.columns["name"]
+    missed = []
+    # Spread over the whole catalog: the old scan cut-off favoured low row ids
+    for row in range(0, len(catalog_index.products), len(catalog_index.products) // 300):
+        name = names.get(row)
+        query = misspell(rng, name, typos)
+        if name not in [product.name for product in catalog_index.search_fuzzy(query)]:
+            missed.append(query)
+    assert missed == []
+
+def test_added_products_are_found_and_replace_their_barcode(catalog_index, tmp_path):
+    path = str(tmp_path / "product_index.pkl")
+    shutil.copy(catalog_index.path, path)
+    index = ProductIndex.load(path)
+    old = index.products[len(index.products) // 2]
+    new = index.products[len(index.products) - 1]
+    new.name, new.sku = "Velvet Glow Primer Deluxe", "VGP-NEW"
+    new.barcode = old.barcode
+    index.add(new)
+
+    assert [product.name for product in index.search_fuzzy("Velvet Glwo Primer Deluxe", limit=1)] == [new.name]
+    assert index.lookup(old.barcode).sku == "VGP-NEW"
+    assert old.name not in [product.name for product in index.search_fuzzy(old.name)]
+
+    # The journal replays the added product on load
+    reloaded = ProductIndex.load(path)
+    assert reloaded.lookup_sku("VGP-NEW").name == new.name
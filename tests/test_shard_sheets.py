@@ -0,0 +1,65 @@
+import os
+import pickle
+
+import openpyxl
+
+from analytics_rollups import load_default_rollups
+from create_excel_workbook import DERIVED_INPUT_SHEETS, DerivedColumns, build_workbook, read_csv_data
+from inventory_model import ReorderItem, parse_number
+from import_workbook import import_csv_directory, locate_table
+from shard_sheets import table_worksheets
+
+def index_totals(ws):
+    """{shard label or "TOTAL": {header: value}} from an index sheet"""
+    headers = [cell.value for cell in ws[4]]
+    rows = {}
+    for row in ws.iter_rows(min_row=5, values_only=True):
+        if row[0] is not None:
+            rows[row[0]] = dict(zip(headers, row))
+    return rows
+
+def test_reorder_index_totals_match_the_planned_shards(generated_sheets):
+    wb = build_workbook(generated_sheets, shard_by="supplier", shard_rows=10)
+    shards = table_worksheets(wb, "Reorder")
+    assert len(shards) > 1
+    totals = index_totals(wb["Reorder"])
+
+    overall_qty = overall_cost = 0
+    for ws in shards:
+        _, rows = locate_table(ws, ReorderItem)
+        order_qty = sum(record.order_qty for _, record in rows)
+        cost = sum(parse_number(ws.cell(row=row_number, column=8).value) for row_number, _ in rows)
+        label = next(label for label, values in totals.items() if values["Open"] == ws.title)
+        assert totals[label]["Rows"] == len(rows)
+        assert totals[label]["Order Qty"] == order_qty
+        assert totals[label]["Total Cost"] == round(cost, 2)
+        overall_qty += order_qty
+        overall_cost += cost
+    assert totals["TOTAL"]["Order Qty"] == overall_qty
+    assert totals["TOTAL"]["Total Cost"] == round(overall_cost, 2)
+
+def test_companion_shards_get_the_same_derived_columns(generated_sheets, tmp_path):
+    rollups = load_default_rollups(generated_sheets)
+    in_workbook = build_workbook(generated_sheets, shard_rows=50, rollups=rollups)
+    shard_dir = str(tmp_path / "shards")
+    build_workbook(generated_sheets, shard_dir=shard_dir, shard_rows=50, rollups=rollups)
+
+    for sheet_name in ("Products", "Inventory", "Reorder"):
+        shards = table_worksheets(in_workbook, sheet_name)
+        paths = sorted(name for name in os.listdir(shard_dir) if name.startswith(sheet_name + " "))
+        assert len(paths) == len(shards) > 1
+        for ws, path in zip(shards, paths):
+            companion = openpyxl.load_workbook(os.path.join(shard_dir, path))[sheet_name]
+            assert list(companion.values) == list(ws.values)
+
+def test_shard_payload_holds_only_its_rows(generated_sheets):
+    rollups = load_default_rollups(generated_sheets)
+    tables = {sheet_name: list(records) for sheet_name, records in import_csv_directory(generated_sheets, DERIVED_INPUT_SHEETS)}
+    derived = DerivedColumns(tables, rollups)
+    rows = read_csv_data(os.path.join(generated_sheets, "Products.csv"))
+    header = next(pos for pos, row in enumerate(rows) if row and row[0] == "Product Name")
+    shard = derived.shard("Products", rows[:header + 11])
+
+    assert shard.rollups is None
+    assert len(shard.metrics.names) == 10 and len(shard.plan.positions) == 10
+    assert len(pickle.dumps(shard)) < len(pickle.dumps(derived)) / 5
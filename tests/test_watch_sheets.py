@@ -0,0 +1,89 @@
+import csv
+import os
+import shutil
+
+import pytest
+
+import export_tables
+import watch_sheets
+from inventory_model import Transaction
+from watch_sheets import SheetWatcher
+
+SAMPLE_SHEETS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sheets")
+
+@pytest.fixture
+def watcher(generated_sheets, tmp_path):
+    # The generated catalog has no Dashboard, Analytics or Instructions sheets
+    for sheet_name in ("Dashboard", "Analytics", "Instructions"):
+        shutil.copy(os.path.join(SAMPLE_SHEETS, f"{sheet_name}.csv"), generated_sheets)
+    watcher = SheetWatcher(generated_sheets, str(tmp_path / "workbook.xlsx"), exports_dir=str(tmp_path / "exports"))
+    watcher.start()
+    return watcher
+
+def append_sale(watcher, product, quantity):
+    last = watcher.records("QuickAdd")[-1]
+    with open(watcher.csv_paths["QuickAdd"], 'a', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerow([last.date.isoformat(), product, f"-{quantity}", "Sale", "", "POS"])
+    # Make sure the signature changes even within the filesystem's timestamp resolution
+    os.utime(watcher.csv_paths["QuickAdd"], ns=(0, 0))
+    return last.date
+
+def day_units(watcher, day):
+    return watcher.rollups.totals("daily", day.isoformat())["units"]
+
+def test_only_changed_rows_are_parsed_and_folded(watcher, monkeypatch):
+    product = watcher.records("Products")[0].name
+    kept = {id(record) for record in watcher.records("QuickAdd")}
+    units = day_units(watcher, watcher.records("QuickAdd")[-1].date)
+
+    day = append_sale(watcher, product, 7)
+    parsed = []
+    from_row = Transaction.from_row
+    monkeypatch.setattr(Transaction, "from_row", classmethod(lambda cls, row, positions: parsed.append(row) or from_row(row, positions)))
+    assert watcher.refresh(watcher.poll()) is not None
+
+    assert [row[1] for row in parsed] == [product]
+    assert {id(record) for record in watcher.records("QuickAdd")[:-1]} == kept
+    assert day_units(watcher, day) == units + 7
+
+def test_failed_refresh_is_retried(watcher, monkeypatch):
+    append_sale(watcher, watcher.records("Products")[0].name, 3)
+    saves = []
+    save_workbook = watch_sheets.save_workbook
+
+    def flaky_save(wb, path):
+        saves.append(path)
+        if len(saves) == 1:
+            raise OSError("disk full")
+        save_workbook(wb, path)
+
+    def sleep(seconds):
+        if len(saves) == 2:
+            raise KeyboardInterrupt
+    monkeypatch.setattr(watch_sheets, "save_workbook", flaky_save)
+    monkeypatch.setattr(watch_sheets.time, "sleep", sleep)
+
+    with pytest.raises(KeyboardInterrupt):
+        watcher.watch(debounce_seconds=0)
+    assert len(saves) == 2
+    assert watcher.stale() == set()
+    assert watcher.records("QuickAdd")[-1].change == -3
+
+def test_exports_come_from_the_kept_records(watcher, monkeypatch):
+    products_csv = watcher.csv_paths["Products"]
+    with open(products_csv, 'r', encoding='utf-8', newline='') as file:
+        rows = list(csv.reader(file))
+    header = next(pos for pos, row in enumerate(rows) if row and row[0] == "Product Name")
+    rows[header + 1][rows[header].index("Notes")] = "Reformulated"
+    with open(products_csv, 'w', encoding='utf-8', newline='') as file:
+        csv.writer(file).writerows(rows)
+    os.utime(products_csv, ns=(0, 0))
+
+    def no_reread(*args):
+        raise AssertionError("exports re-read the sheet")
+    monkeypatch.setattr(export_tables, "parse_csv_table", no_reread)
+    watcher.refresh(watcher.poll())
+
+    with open(os.path.join(watcher.exports_dir, "products.csv"), 'r', encoding='utf-8', newline='') as file:
+        exported = list(csv.reader(file))
+    assert exported[1][exported[0].index("Notes")] == "Reformulated"
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Beauty Pro Inventory System - Sheet Watcher
+Long-running mode that keeps the parsed sheets, sales rollups and built workbook in memory,
+polls sheets/ for changed CSVs and rebuilds only the worksheets a change affects.
+"""
+
+import os
+import sys
+import time
+from openpyxl import Workbook
+
+from analytics_rollups import RollupStore, store_path_for, load_default_rollups, sync_transactions
+from create_excel_workbook import SHEETS_DATA, DERIVED_INPUT_SHEETS, DerivedColumns, SheetBuilder, read_csv_data
+from export_tables import EXPORT_SHEETS, EXPORT_FORMATS, export_records
+from import_workbook import common_ends, iter_numbered_records, update_numbered_records
+from inventory_model import RECORD_TYPES
+from shard_sheets import SHARD_ROWS, table_worksheets
+from workbook_io import save_workbook
+
+# Seconds between directory scans
+POLL_SECONDS = 0.5
+# Quiet period after the last write before a burst of changes is applied
+DEBOUNCE_SECONDS = 2.0
+
+# Sheets read by the metrics and reorder plan, and the sheets those steps write into
+DERIVED_INPUTS = {"Products", "Inventory", "Suppliers", "QuickAdd"}
+DERIVED_OUTPUTS = {"Products", "Inventory", "Reorder", "Analytics", "Dashboard"}
+# Sheets also kept as parsed records: the metric and plan inputs, QuickAdd for the rollups and the exported tables
+MODEL_SHEETS = tuple(dict.fromkeys(DERIVED_INPUT_SHEETS + ("QuickAdd",) + EXPORT_SHEETS))
+
+def file_signature(path):
+    """(mtime, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def affected_sheets(changed):
+    """Worksheets to rebuild for a set of changed sheets"""
+    rebuild = set(changed)
+    if rebuild & (DERIVED_INPUTS | DERIVED_OUTPUTS):
+        # The derived columns and summaries are written on top of these sheets, so they are rebuilt together
+        rebuild |= DERIVED_OUTPUTS
+    return rebuild
+
+def changed_row_count(old_rows, new_rows):
+    """Rows between the first and last difference, skipping the rows both versions start and end with"""
+    prefix, suffix = common_ends(old_rows, new_rows)
+    return max(len(old_rows), len(new_rows)) - prefix - suffix
+
+def remove_sheet(wb, sheet_name):
+    """Remove a worksheet and, when it is a shard index, the shard sheets it links to"""
+    for ws in table_worksheets(wb, sheet_name):
+        if ws.title != sheet_name:
+            wb.remove(ws)
+    wb.remove(wb[sheet_name])
+
+class SheetWatcher:
+    """In-memory sheet rows, rollups and workbook, refreshed from changed CSVs"""
+
+    def __init__(self, sheets_dir, output_path, store_path=None, exports_dir=None,
+                 shard_dir=None, shard_by="rows", shard_rows=SHARD_ROWS):
+        self.sheets_dir = sheets_dir
+        self.output_path = output_path
+        self.store_path = store_path or store_path_for(sheets_dir)
+        self.exports_dir = exports_dir
+        # Long tables are sharded as by build_workbook: into sheets, or companion workbooks in shard_dir
+        self.shard_dir = shard_dir
+        self.shard_by = shard_by
+        self.shard_rows = shard_rows
+        self.csv_paths = {sheet_name: os.path.join(sheets_dir, csv_file) for sheet_name, csv_file in SHEETS_DATA}
+        # CSV signatures as of the last scan, and of the versions the kept rows were read from
+        self.seen = {}
+        self.signatures = {}
+        # Rows, (row number, record) pairs, rollups and workbook as of the last refresh that saved successfully
+        self.rows = {}
+        self.tables = {}
+        self.rollups = None
+        self.wb = None
+
+    def start(self):
+        """Cold build: parse every sheet, load the rollups and build the workbook once"""
+        for sheet_name, csv_path in self.csv_paths.items():
+            self.signatures[sheet_name] = self.seen[sheet_name] = file_signature(csv_path)
+            self.rows[sheet_name] = read_csv_data(csv_path)
+        self.tables = {sheet_name: list(iter_numbered_records(self.rows[sheet_name], RECORD_TYPES[sheet_name]))
+                       for sheet_name in MODEL_SHEETS}
+        self.rollups = load_default_rollups(self.sheets_dir, self.store_path)
+        self.wb = self.build_workbook(self.rows, self.tables)
+        save_workbook(self.wb, self.output_path)
+
+    def records(self, sheet_name, tables=None):
+        """Records of one kept table, in row order"""
+        return [record for _, record in (tables or self.tables)[sheet_name]]
+
+    def build_workbook(self, rows, tables):
+        """Full build from parsed rows, used at start and after a failed refresh"""
+        wb = Workbook()
+        wb.remove(wb.active)
+        self.build_sheets(wb, rows, [sheet_name for sheet_name, _ in SHEETS_DATA], self.derived_columns(tables))
+        return wb
+
+    def build_sheets(self, wb, rows, sheet_names, derived=None):
+        """Build sheets from parsed rows, replacing those already in wb in place and sharding long tables"""
+        builder = SheetBuilder(wb, derived, self.shard_dir, self.shard_by, self.shard_rows)
+        try:
+            for sheet_name in sheet_names:
+                index = None
+                if sheet_name in wb.sheetnames:
+                    index = wb.sheetnames.index(sheet_name)
+                    remove_sheet(wb, sheet_name)
+                builder.add(sheet_name, rows[sheet_name], index)
+        finally:
+            builder.close()
+        if derived is not None:
+            derived.write_summaries(wb)
+
+    def poll(self):
+        """Sheets whose CSV was written since the last scan"""
+        changed = set()
+        for sheet_name, csv_path in self.csv_paths.items():
+            signature = file_signature(csv_path)
+            if signature != self.seen.get(sheet_name):
+                self.seen[sheet_name] = signature
+                changed.add(sheet_name)
+        return changed
+
+    def stale(self):
+        """Sheets whose CSV differs from the version the kept rows were read from, including failed refreshes"""
+        return {sheet_name for sheet_name, signature in self.seen.items() if signature != self.signatures.get(sheet_name)}
+
+    def apply_transactions(self, removed, added, transactions, products):
+        """Fold changed QuickAdd rows into the rollups, replacing only the days they fall on"""
+        days = {record.date for record in removed + added} - {None}
+        transactions = [transaction for transaction in transactions if transaction.date in days]
+        folded = sync_transactions(self.rollups, transactions, products)
+        # Days whose transactions were all removed are replaced with an empty day
+        emptied = days - {transaction.date for transaction in transactions}
+        for day in emptied:
+            self.rollups.append_day(day, [], [], [], [], [], [])
+            self.rollups.day_digests.pop(day.isoformat(), None)
+        return bool(folded or emptied)
+
+    def derived_columns(self, tables):
+        """Margins, metrics and reorder plan computed from the kept records, written as sheets are built"""
+        return DerivedColumns({sheet_name: self.records(sheet_name, tables) for sheet_name in DERIVED_INPUT_SHEETS},
+                              self.rollups)
+
+    def refresh(self, changed):
+        """Apply a debounced batch of changed sheets and regenerate the affected outputs
+
+        Only the rows between the unchanged ends of each CSV are parsed into records. The new rows, records
+        and rollups (and the CSV signatures) are only kept once the workbook is saved; if any step fails, the
+        rollups are reloaded from the store, the sheets stay stale, and the next refresh rebuilds the whole
+        workbook from the kept rows.
+        """
+        start = time.perf_counter()
+        # Taken before reading, so a write during the refresh leaves the sheet stale
+        signatures = {sheet_name: file_signature(self.csv_paths[sheet_name]) for sheet_name in changed}
+        new_rows = {sheet_name: read_csv_data(self.csv_paths[sheet_name]) for sheet_name in changed}
+        row_counts = {sheet_name: changed_row_count(self.rows[sheet_name], new_rows[sheet_name]) for sheet_name in changed}
+        changed = {sheet_name for sheet_name, count in row_counts.items() if count}
+        if not changed and self.wb is not None:
+            self.signatures.update(signatures)
+            return None
+        rows = dict(self.rows)
+        rows.update((sheet_name, new_rows[sheet_name]) for sheet_name in changed)
+        tables = dict(self.tables)
+        changed_records = {}
+        for sheet_name in changed & set(MODEL_SHEETS):
+            tables[sheet_name], removed, added = update_numbered_records(
+                self.tables[sheet_name], self.rows[sheet_name], rows[sheet_name], RECORD_TYPES[sheet_name])
+            changed_records[sheet_name] = (removed, added)
+
+        try:
+            rollups_changed = "QuickAdd" in changed and self.apply_transactions(
+                *changed_records["QuickAdd"], self.records("QuickAdd", tables), self.records("Products", tables))
+            if self.wb is None:
+                rebuild = {sheet_name for sheet_name, _ in SHEETS_DATA}
+                wb = self.build_workbook(rows, tables)
+            else:
+                rebuild = affected_sheets(changed)
+                wb = self.wb
+                derived = self.derived_columns(tables) if rebuild & DERIVED_OUTPUTS else None
+                self.build_sheets(wb, rows, [sheet_name for sheet_name, _ in SHEETS_DATA if sheet_name in rebuild], derived)
+            save_workbook(wb, self.output_path)
+        except Exception:
+            # The saved store and workbook still match the kept rows; drop the half-applied state
+            self.rollups = RollupStore.load(self.store_path)
+            self.wb = None
+            raise
+        if rollups_changed:
+            self.rollups.save(self.store_path)
+        self.rows = rows
+        self.tables = tables
+        self.wb = wb
+        self.signatures.update(signatures)
+
+        if self.exports_dir:
+            os.makedirs(self.exports_dir, exist_ok=True)
+            for sheet_name in changed & set(EXPORT_SHEETS):
+                for fmt in EXPORT_FORMATS:
+                    try:
+                        export_records(self.records(sheet_name), sheet_name, fmt, self.exports_dir)
+                    except ImportError as e:
+                        print(e)
+
+        summary = ", ".join(f"{sheet_name} ({row_counts[sheet_name]} rows)" for sheet_name in sorted(changed)) or "a failed refresh"
+        print(f"Rebuilt {len(rebuild)} sheets after changes to {summary} in {time.perf_counter() - start:.2f}s")
+        return rebuild
+
+    def watch(self, poll_seconds=POLL_SECONDS, debounce_seconds=DEBOUNCE_SECONDS):
+        """Poll until interrupted, applying each burst of changes once writes have settled"""
+        last_change = 0.0
+        while True:
+            if self.poll():
+                last_change = time.monotonic()
+            elif time.monotonic() - last_change >= debounce_seconds:
+                pending = self.stale()
+                if pending:
+                    try:
+                        self.refresh(pending)
+                    except Exception as e:
+                        # Keep watching; the sheets stay stale and are retried once writes have settled again
+                        print(f"Error rebuilding after changes to {', '.join(sorted(pending))}, retrying: {e}")
+                        last_change = time.monotonic()
+            time.sleep(poll_seconds)
+
+if __name__ == "__main__":
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    sheets_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, "sheets")
+    output_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, "Beauty_Pro_Inventory_System.xlsx")
+    exports_dir = sys.argv[3] if len(sys.argv) > 3 else None
+    shard_dir = sys.argv[4] if len(sys.argv) > 4 else None
+
+    start = time.perf_counter()
+    watcher = SheetWatcher(sheets_dir, output_path, exports_dir=exports_dir, shard_dir=shard_dir)
+    watcher.start()
+    print(f"Built {output_path} in {time.perf_counter() - start:.2f}s, watching {sheets_dir} (Ctrl+C to stop)")
+    try:
+        watcher.watch()
+    except KeyboardInterrupt:
+        print("Stopped watching")